@@ -0,0 +1,116 @@
+"""Fallback ASX CSV download via the ASX directory page.
+
+Only imported by the handler when the direct CSV download fails, so bs4 and
+the HTML scraping code stay off the normal cold-start path.
+"""
+
+import re
+
+from bs4 import BeautifulSoup
+from loguru import logger
+
+from modules.asx_symbol_updater._http import (
+    _SESSION,
+    ASX_DIRECTORY_URL,
+    ASXSymbolUpdaterError,
+)
+
+# URLs embedded in the CSV link's onclick handler
+_URL_RE = re.compile(r'https?://[^\s\'"]+')
+
+
+def _is_csv_link_text(text: str | None) -> bool:
+    """Match the text of the CSV download link on the ASX directory page."""
+    return text is not None and 'CSV download' in text
+
+
+def extract_csv_download_url(html_content: str) -> str:
+    """Extract the CSV download URL from the ASX directory page.
+    
+    Args:
+        html_content: HTML content of the ASX directory page
+        
+    Returns:
+        CSV download URL
+        
+    Raises:
+        ASXSymbolUpdaterError: If CSV download link not found
+    """
+    # lxml is the C-backed tree builder; the directory page is large enough that
+    # the pure-Python html.parser dominates the fallback path.
+    soup = BeautifulSoup(html_content, 'lxml')
+    
+    # Look for the CSV download link
+    # The link text is "All ASX listed companies (CSV download)"
+    csv_link = soup.find('a', string=_is_csv_link_text)
+    
+    if not csv_link:
+        # Try alternate approach - look for data-download attribute or onclick
+        csv_link = soup.find('a', {'data-download': True})
+    
+    if not csv_link:
+        raise ASXSymbolUpdaterError(
+            "Could not find CSV download link on ASX directory page",
+            details={"url": ASX_DIRECTORY_URL}
+        )
+    
+    # Get the actual download URL from onclick or href
+    onclick = csv_link.get('onclick', '')
+    href = csv_link.get('href', '')
+    
+    # The onclick might contain a URL
+    if 'http' in onclick:
+        urls = _URL_RE.findall(onclick)
+        if urls:
+            return urls[0]
+    
+    if href and href.startswith('http'):
+        return href
+    elif href and not href.startswith('javascript'):
+        # Relative URL
+        return f"https://www.asx.com.au{href}"
+    
+    raise ASXSymbolUpdaterError(
+        "Could not extract CSV download URL from link",
+        details={"onclick": onclick, "href": href}
+    )
+
+
+def download_csv_from_directory_page() -> bytes:
+    """Download the ASX CSV via the link on the ASX directory page.
+    
+    Returns:
+        Raw CSV content as bytes
+        
+    Raises:
+        ASXSymbolUpdaterError: If the download link cannot be found
+        requests.exceptions.RequestException: If a request fails
+    """
+    logger.info("Fetching ASX directory page", url=ASX_DIRECTORY_URL)
+    
+    # Get the directory page to find the CSV download link
+    response = _SESSION.get(
+        ASX_DIRECTORY_URL,
+        timeout=30
+    )
+    response.raise_for_status()
+    
+    # Extract CSV download URL
+    csv_url = extract_csv_download_url(response.text)
+    logger.info("Found CSV download URL", url=csv_url)
+    
+    # Download the CSV
+    csv_response = _SESSION.get(
+        csv_url,
+        timeout=60
+    )
+    csv_response.raise_for_status()
+    
+    csv_content = csv_response.content
+    logger.info(
+        "Successfully downloaded ASX CSV",
+        size_bytes=len(csv_content),
+        content_length=csv_response.headers.get('Content-Length')
+    )
+    
+    return csv_content
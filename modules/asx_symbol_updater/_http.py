@@ -0,0 +1,47 @@
+"""HTTP session and errors shared by the ASX handler and its fallback.
+
+Kept separate from the handler so the fallback module can import them
+without importing the handler back.
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from modules.common.exceptions import StockStreamError
+
+ASX_DIRECTORY_URL = "https://www.asx.com.au/markets/trade-our-cash-market/directory"
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+
+class ASXSymbolUpdaterError(StockStreamError):
+    """Error specific to ASX Symbol Updater."""
+    pass
+
+
+def _create_http_session() -> requests.Session:
+    """Create a pooled HTTP session with retries for ASX downloads.
+
+    The session lives at module scope so warm Lambda invocations, and the
+    fallback requests within one invocation, reuse keep-alive connections
+    instead of paying a fresh TCP+TLS handshake per request.
+
+    Returns:
+        Configured requests session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 502, 503, 504],
+        ),
+    )
+    session.mount('https://', adapter)
+    session.headers.update({'User-Agent': USER_AGENT})
+    return session
+
+
+_SESSION = _create_http_session()
@@ -3,89 +3,85 @@
 import csv
 import json
 import os
-from datetime import date, datetime
-from io import StringIO
+import time
+from datetime import date, datetime, timezone
+from functools import lru_cache
+from io import BytesIO, TextIOWrapper
+from itertools import chain, islice
 from typing import Any
 
-import boto3
 import requests
-from bs4 import BeautifulSoup
 from loguru import logger
 
-from modules.common.exceptions import StockStreamError
+from modules.asx_symbol_updater._http import _SESSION, ASX_DIRECTORY_URL, ASXSymbolUpdaterError
+from modules.common.serialization import json_dumps
 
 # Auto-configure logger for Lambda or local environment
 from modules.common import logger as _  # noqa: F401 - triggers auto-configuration
 
 # Constants
-ASX_DIRECTORY_URL = "https://www.asx.com.au/markets/trade-our-cash-market/directory"
 # ASX_CSV_DIRECT_URL = "https://www.asx.com.au/asx/research/ASXListedCompanies.csv"  # Direct CSV download, missing listing date and market cap
 ASX_CSV_DIRECT_URL = "https://asx.api.markitdigital.com/asx-research/1.0/companies/directory/file"
 S3_SYMBOLS_PREFIX = "symbols/"
-BATCH_SIZE = 100
+BATCH_SIZE = 400
+CSV_HEADER_KEYWORDS = ('code', 'symbol', 'company', 'name')
+CSV_HEADER_SEARCH_LINES = 5
 
+# Accepted column names for each field, in order of preference
+SYMBOL_COLUMNS = ('ASX code', 'Code', 'Symbol', 'Ticker', 'ASX Code')
+NAME_COLUMNS = ('Company name', 'Name', 'Company')
+SECTOR_COLUMNS = ('GICS industry group', 'Industry', 'Sector')
+MARKET_CAP_COLUMNS = ('Market Cap', 'MarketCap')
 
-class ASXSymbolUpdaterError(StockStreamError):
-    """Error specific to ASX Symbol Updater."""
-    pass
 
+# Managed transfer settings: payloads above the threshold are split into parts
+# uploaded concurrently instead of a single-stream PUT
+S3_MULTIPART_THRESHOLD = 5 * 1024 * 1024
+S3_MULTIPART_CHUNKSIZE = 5 * 1024 * 1024
+S3_MAX_CONCURRENCY = 8
 
-def extract_csv_download_url(html_content: str) -> str:
-    """Extract the CSV download URL from the ASX directory page.
+# S3 client, created on first use and reused across warm invocations
+_s3_client: Any = None
+
+# Small ASX listing used when MOCK_ASX_SOURCE / MOCK_AWS are set for local testing
+_MOCK_CSV_BYTES = b"""ASX code,Company name,GICS industry group,Market Cap
+BHP,BHP Group Limited,Materials,180500000000
+CBA,Commonwealth Bank,Financials,165200000000
+NAB,National Australia Bank,Financials,98450000000
+WBC,Westpac Banking Corporation,Financials,87320000000
+ANZ,Australia and New Zealand Banking Group,Financials,75690000000
+CSL,CSL Limited,Health Care Equipment & Services,142300000000
+WES,Wesfarmers Limited,Consumer Discretionary Distribution & Retail,68900000000
+WOW,Woolworths Group,Consumer Staples Distribution & Retail,45200000000
+FMG,Fortescue Metals Group,Materials,56800000000
+RIO,Rio Tinto Limited,Materials,134700000000"""
+
+# Downloaded CSV and its parsed companies, kept across warm invocations.
+# The ASX list changes at most once per day, so entries are keyed by date.
+_CSV_CACHE: dict[date, tuple[bytes, list[dict[str, str]]]] = {}
+
+
+def get_s3_client() -> Any:
+    """Get the shared S3 client, creating it on first use.
+    
+    boto3 is imported here rather than at module level because loading it
+    dominates cold-start time, and the client is cached for warm invocations.
     
-    Args:
-        html_content: HTML content of the ASX directory page
-        
     Returns:
-        CSV download URL
-        
-    Raises:
-        ASXSymbolUpdaterError: If CSV download link not found
+        Boto3 S3 client
     """
-    soup = BeautifulSoup(html_content, 'html.parser')
-    
-    # Look for the CSV download link
-    # The link text is "All ASX listed companies (CSV download)"
-    csv_link = soup.find('a', string=lambda text: text and 'CSV download' in text)
-    
-    if not csv_link:
-        # Try alternate approach - look for data-download attribute or onclick
-        csv_link = soup.find('a', {'data-download': True})
-    
-    if not csv_link:
-        raise ASXSymbolUpdaterError(
-            "Could not find CSV download link on ASX directory page",
-            details={"url": ASX_DIRECTORY_URL}
-        )
-    
-    # Get the actual download URL from onclick or href
-    onclick = csv_link.get('onclick', '')
-    href = csv_link.get('href', '')
-    
-    # The onclick might contain a URL
-    if 'http' in onclick:
-        import re
-        urls = re.findall(r'https?://[^\s\'"]+', onclick)
-        if urls:
-            return urls[0]
-    
-    if href and href.startswith('http'):
-        return href
-    elif href and not href.startswith('javascript'):
-        # Relative URL
-        return f"https://www.asx.com.au{href}"
-    
-    raise ASXSymbolUpdaterError(
-        "Could not extract CSV download URL from link",
-        details={"onclick": onclick, "href": href}
-    )
+    global _s3_client
+    if _s3_client is None:
+        import boto3
+        _s3_client = boto3.client('s3')
+    return _s3_client
 
 
-def download_asx_csv() -> str:
+def download_asx_csv() -> bytes:
     """Download ASX listed companies CSV.
     
     Returns:
-        CSV content as string
+        Raw CSV content as bytes
         
     Raises:
         ASXSymbolUpdaterError: If download fails
@@ -93,52 +89,25 @@ def download_asx_csv() -> str:
     # Mock ASX source for local testing (use small mock data)
     if os.getenv("MOCK_ASX_SOURCE") == "true":
         logger.info("Using mock ASX data for local testing")
-        mock_csv = """ASX code,Company name,GICS industry group,Market Cap
-BHP,BHP Group Limited,Materials,180500000000
-CBA,Commonwealth Bank,Financials,165200000000
-NAB,National Australia Bank,Financials,98450000000
-WBC,Westpac Banking Corporation,Financials,87320000000
-ANZ,Australia and New Zealand Banking Group,Financials,75690000000
-CSL,CSL Limited,Health Care Equipment & Services,142300000000
-WES,Wesfarmers Limited,Consumer Discretionary Distribution & Retail,68900000000
-WOW,Woolworths Group,Consumer Staples Distribution & Retail,45200000000
-FMG,Fortescue Metals Group,Materials,56800000000
-RIO,Rio Tinto Limited,Materials,134700000000"""
-        return mock_csv
+        return _MOCK_CSV_BYTES
     
     try:
-        logger.info("Fetching ASX directory page", url=ASX_DIRECTORY_URL)
-        
         # First, try the direct CSV URL (more reliable)
         try:
             logger.info("Attempting direct CSV download", url=ASX_CSV_DIRECT_URL)
-            csv_response = requests.get(
+            csv_response = _SESSION.get(
                 ASX_CSV_DIRECT_URL,
-                headers={
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                },
                 timeout=60
             )
             csv_response.raise_for_status()
             
-            csv_content = csv_response.text
+            csv_content = csv_response.content
             logger.info(
                 "Successfully downloaded ASX CSV (direct URL)",
                 size_bytes=len(csv_content),
-                num_lines=csv_content.count('\n')
+                content_length=csv_response.headers.get('Content-Length')
             )
             
-            # Log the full list length (after parsing)
-            try:
-                companies = parse_asx_csv(csv_content)
-                logger.info(
-                    f"ASX CSV contains {len(companies)} companies",
-                    total_companies=len(companies),
-                    sample_symbols=[c['symbol'] for c in companies[:5]]
-                )
-            except Exception as e:
-                logger.warning(f"Could not parse CSV for preview: {str(e)}")
-            
             return csv_content
             
         except requests.exceptions.RequestException as direct_error:
@@ -147,49 +116,11 @@ RIO,Rio Tinto Limited,Materials,134700000000"""
                 url=ASX_CSV_DIRECT_URL
             )
         
-        # Fallback: Get the directory page to find the CSV download link
-        response = requests.get(
-            ASX_DIRECTORY_URL,
-            headers={
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            },
-            timeout=30
-        )
-        response.raise_for_status()
-        
-        # Extract CSV download URL
-        csv_url = extract_csv_download_url(response.text)
-        logger.info("Found CSV download URL", url=csv_url)
-        
-        # Download the CSV
-        csv_response = requests.get(
-            csv_url,
-            headers={
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            },
-            timeout=60
-        )
-        csv_response.raise_for_status()
-        
-        csv_content = csv_response.text
-        logger.info(
-            "Successfully downloaded ASX CSV",
-            size_bytes=len(csv_content),
-            num_lines=csv_content.count('\n')
-        )
+        # Fallback: scrape the directory page for the CSV download link. The
+        # scraper lives in its own module so bs4 is only loaded when needed.
+        from modules.asx_symbol_updater._fallback import download_csv_from_directory_page
         
-        # Log the full list length (after parsing)
-        try:
-            companies = parse_asx_csv(csv_content)
-            logger.info(
-                f"ASX CSV contains {len(companies)} companies",
-                total_companies=len(companies),
-                sample_symbols=[c['symbol'] for c in companies[:5]]
-            )
-        except Exception as e:
-            logger.warning(f"Could not parse CSV for preview: {str(e)}")
-        
-        return csv_content
+        return download_csv_from_directory_page()
         
     except requests.exceptions.RequestException as e:
         raise ASXSymbolUpdaterError(
@@ -198,96 +129,149 @@ RIO,Rio Tinto Limited,Materials,134700000000"""
         )
 
 
-def parse_asx_csv(csv_content: str) -> list[dict[str, str]]:
+def _find_column(header: list[str], aliases: tuple[str, ...]) -> int | None:
+    """Find the position of the first matching column in a CSV header.
+    
+    Args:
+        header: CSV header fields
+        aliases: Accepted column names, in order of preference
+        
+    Returns:
+        Index of the column, or None if no alias is present
+    """
+    for alias in aliases:
+        if alias in header:
+            return header.index(alias)
+    return None
+
+
+def parse_asx_csv(csv_content: bytes) -> list[dict[str, str]]:
     """Parse ASX CSV content into list of company dictionaries.
     
+    Parsing is memoized on the raw bytes, so parsing the same payload again
+    (e.g. the mock data, or a file read back from S3) skips the CSV work.
+    Each call returns fresh copies, so callers may modify the result.
+    
     Args:
-        csv_content: CSV content as string
+        csv_content: Raw CSV content (UTF-8 encoded)
         
     Returns:
         List of dictionaries with keys: symbol, name, sector, market_cap
         
+    Raises:
+        ASXSymbolUpdaterError: If CSV parsing fails
+    """
+    return [dict(company) for company in _parse_asx_csv_cached(csv_content)]
+
+
+@lru_cache(maxsize=2)
+def _parse_asx_csv_cached(csv_content: bytes) -> tuple[dict[str, str], ...]:
+    """Parse ASX CSV content once per payload for parse_asx_csv.
+    
+    The cached result is shared between calls and must not be modified.
+    
+    Args:
+        csv_content: Raw CSV content (UTF-8 encoded)
+        
+    Returns:
+        Tuple of dictionaries with keys: symbol, name, sector, market_cap
+        
     Raises:
         ASXSymbolUpdaterError: If CSV parsing fails
     """
     try:
-        # Skip header lines (ASX CSV often has a header line before the CSV data)
-        lines = csv_content.strip().split('\n')
+        # Decode lazily while iterating lines rather than materializing the text
+        # (utf-8-sig drops a leading byte order mark from the header)
+        lines = TextIOWrapper(BytesIO(csv_content), encoding='utf-8-sig', newline='')
         
-        # Find the first line that looks like a CSV header (contains commas and relevant keywords)
-        csv_start_idx = 0
-        for i, line in enumerate(lines):
-            if any(keyword in line.lower() for keyword in ['code', 'symbol', 'company', 'name']):
-                csv_start_idx = i
+        # Skip header lines (ASX CSV often has a header line before the CSV data)
+        # by advancing to the first line that looks like a CSV header. Only the
+        # first few lines, and the start of each, are checked.
+        preamble = []
+        for line in islice(lines, CSV_HEADER_SEARCH_LINES):
+            lowered = line[:200].lower()
+            if any(keyword in lowered for keyword in CSV_HEADER_KEYWORDS):
+                rows = chain([line], lines)
                 break
+            preamble.append(line)
+        else:
+            # No header-like line found, parse the content from the start
+            rows = chain(preamble, lines)
+        
+        reader = csv.reader(rows)
+        header = next(reader, [])
+        
+        # Resolve column positions once from the header
+        # CSV columns may vary, so we handle different possible column names
+        symbol_idx = _find_column(header, SYMBOL_COLUMNS)
+        name_idx = _find_column(header, NAME_COLUMNS)
+        sector_idx = _find_column(header, SECTOR_COLUMNS)
+        market_cap_idx = _find_column(header, MARKET_CAP_COLUMNS)
         
-        csv_data = '\n'.join(lines[csv_start_idx:])
-        reader = csv.DictReader(StringIO(csv_data))
         companies = []
         
-        for row in reader:
-            # Extract relevant fields
-            # CSV columns may vary, so we handle different possible column names
-            symbol = (
-                row.get('ASX code') or 
-                row.get('Code') or 
-                row.get('Symbol') or 
-                row.get('Ticker') or
-                row.get('ASX Code') or
-                ''
-            ).strip()
-            
-            name = (
-                row.get('Company name') or 
-                row.get('Name') or 
-                row.get('Company') or
-                ''
-            ).strip()
-            
-            sector = (
-                row.get('GICS industry group') or 
-                row.get('Industry') or 
-                row.get('Sector') or
-                'Unknown'
-            ).strip()
-            
-            market_cap = (
-                row.get('Market Cap') or 
-                row.get('MarketCap') or 
-                ''
-            ).strip()
-            
-            if symbol and name:
+        if symbol_idx is not None and name_idx is not None:
+            for row in reader:
+                num_fields = len(row)
+                symbol = row[symbol_idx].strip() if symbol_idx < num_fields else ''
+                name = row[name_idx].strip() if name_idx < num_fields else ''
+                
+                if not (symbol and name):
+                    continue
+                
+                sector = (
+                    row[sector_idx].strip()
+                    if sector_idx is not None and sector_idx < num_fields
+                    else ''
+                )
+                market_cap = (
+                    row[market_cap_idx].strip()
+                    if market_cap_idx is not None and market_cap_idx < num_fields
+                    else ''
+                )
+                
                 companies.append({
                     'symbol': symbol,
                     'name': name,
-                    'sector': sector,
+                    'sector': sector or 'Unknown',
                     'market_cap': market_cap
                 })
         
         if not companies:
             raise ASXSymbolUpdaterError(
                 "No companies found in CSV",
-                details={"error": "No companies found in CSV", "csv_preview": csv_content[:500]}
+                details={"error": "No companies found in CSV", "csv_preview": csv_content[:500].decode('utf-8', errors='replace')}
             )
         
         logger.info(f"Parsed {len(companies)} companies from CSV")
-        return companies
+        return tuple(companies)
         
     except Exception as e:
         if isinstance(e, ASXSymbolUpdaterError):
             raise
         raise ASXSymbolUpdaterError(
             f"Failed to parse ASX CSV: {str(e)}",
-            details={"error": str(e), "csv_preview": csv_content[:500]}
+            details={"error": str(e), "csv_preview": csv_content[:500].decode('utf-8', errors='replace')}
         )
 
 
-def upload_to_s3(csv_content: str, bucket: str, upload_date: date) -> str:
+def get_symbols_s3_key(upload_date: date) -> str:
+    """Build the S3 key of the symbols file for a given date.
+    
+    Args:
+        upload_date: Date of the symbols file
+        
+    Returns:
+        S3 key (e.g., "symbols/2025-12-26-symbols.csv")
+    """
+    return f"{S3_SYMBOLS_PREFIX}{upload_date.isoformat()}-symbols.csv"
+
+
+def upload_to_s3(csv_content: bytes, bucket: str, upload_date: date) -> str:
     """Upload CSV content to S3.
     
     Args:
-        csv_content: CSV content as string
+        csv_content: Raw CSV content
         bucket: S3 bucket name
         upload_date: Date for the file
         
@@ -297,7 +281,7 @@ def upload_to_s3(csv_content: str, bucket: str, upload_date: date) -> str:
     Raises:
         ASXSymbolUpdaterError: If upload fails
     """
-    s3_key = f"{S3_SYMBOLS_PREFIX}{upload_date.isoformat()}-symbols.csv"
+    s3_key = get_symbols_s3_key(upload_date)
     
     # Mock AWS for local testing (skip S3 upload)
     if os.getenv("MOCK_AWS") == "true":
@@ -309,7 +293,9 @@ def upload_to_s3(csv_content: str, bucket: str, upload_date: date) -> str:
         )
         return s3_key
     
-    s3_client = boto3.client('s3')
+    from boto3.s3.transfer import TransferConfig
+    
+    s3_client = get_s3_client()
     
     try:
         logger.info(
@@ -319,16 +305,24 @@ def upload_to_s3(csv_content: str, bucket: str, upload_date: date) -> str:
             size_bytes=len(csv_content)
         )
         
-        s3_client.put_object(
+        s3_client.upload_fileobj(
+            BytesIO(csv_content),
             Bucket=bucket,
             Key=s3_key,
-            Body=csv_content.encode('utf-8'),
-            ContentType='text/csv',
-            Metadata={
-                'source': 'asx-website',
-                'upload_date': upload_date.isoformat(),
-                'upload_timestamp': datetime.utcnow().isoformat()
-            }
+            ExtraArgs={
+                'ContentType': 'text/csv',
+                'Metadata': {
+                    'source': 'asx-website',
+                    'upload_date': upload_date.isoformat(),
+                    'upload_timestamp': datetime.now(timezone.utc).isoformat()
+                }
+            },
+            Config=TransferConfig(
+                multipart_threshold=S3_MULTIPART_THRESHOLD,
+                multipart_chunksize=S3_MULTIPART_CHUNKSIZE,
+                max_concurrency=S3_MAX_CONCURRENCY,
+                use_threads=True,
+            )
         )
         
         logger.info("Successfully uploaded to S3", key=s3_key)
@@ -341,6 +335,103 @@ def upload_to_s3(csv_content: str, bucket: str, upload_date: date) -> str:
         )
 
 
+def get_s3_object_size(bucket: str, s3_key: str) -> int | None:
+    """Get the size of an object in S3 with a HEAD request.
+    
+    Args:
+        bucket: S3 bucket name
+        s3_key: S3 key of the object
+        
+    Returns:
+        Object size in bytes, or None if the object does not exist
+        
+    Raises:
+        ASXSymbolUpdaterError: If the request fails for another reason
+    """
+    # Mock AWS for local testing (nothing is stored)
+    if os.getenv("MOCK_AWS") == "true":
+        return None
+    
+    s3_client = get_s3_client()
+    
+    try:
+        response = s3_client.head_object(Bucket=bucket, Key=s3_key)
+    except s3_client.exceptions.ClientError as e:
+        if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+            return None
+        raise ASXSymbolUpdaterError(
+            f"Failed to check S3 object: {str(e)}",
+            details={"bucket": bucket, "key": s3_key, "error": str(e)}
+        )
+    
+    return int(response['ContentLength'])
+
+
+def verify_s3_upload(bucket: str, s3_key: str, expected_size: int) -> None:
+    """Verify that an uploaded file exists in S3 with the expected size.
+    
+    Args:
+        bucket: S3 bucket name
+        s3_key: S3 key of the uploaded file
+        expected_size: Expected object size in bytes
+        
+    Raises:
+        ASXSymbolUpdaterError: If the object is missing or its size differs
+    """
+    # Mock AWS for local testing (nothing was uploaded)
+    if os.getenv("MOCK_AWS") == "true":
+        logger.info("Mock AWS: Skipping S3 upload verification", key=s3_key)
+        return
+    
+    actual_size = get_s3_object_size(bucket, s3_key)
+    
+    if actual_size != expected_size:
+        raise ASXSymbolUpdaterError(
+            "Uploaded symbols file is missing or its size does not match",
+            details={
+                "bucket": bucket,
+                "key": s3_key,
+                "expected_size": expected_size,
+                "actual_size": actual_size
+            }
+        )
+    
+    logger.info("Verified S3 upload", key=s3_key, size_bytes=expected_size)
+
+
+def _find_latest_symbols_key(s3_client: Any, bucket: str) -> str:
+    """Find the most recent symbols file by scanning the symbols prefix.
+    
+    ISO dates in the keys sort lexicographically, so the latest file is the
+    greatest key; it is tracked while paging rather than sorting a full listing.
+    
+    Args:
+        s3_client: Boto3 S3 client
+        bucket: S3 bucket name
+        
+    Returns:
+        S3 key of the latest symbols file
+        
+    Raises:
+        ASXSymbolUpdaterError: If no symbol files exist
+    """
+    latest_key = None
+    paginator = s3_client.get_paginator('list_objects_v2')
+    
+    for page in paginator.paginate(Bucket=bucket, Prefix=S3_SYMBOLS_PREFIX):
+        for obj in page.get('Contents', []):
+            if latest_key is None or obj['Key'] > latest_key:
+                latest_key = obj['Key']
+    
+    if latest_key is None:
+        raise ASXSymbolUpdaterError(
+            "No symbol files found in S3",
+            details={"bucket": bucket, "prefix": S3_SYMBOLS_PREFIX}
+        )
+    
+    return latest_key
+
+
 def get_latest_symbols_from_s3(bucket: str) -> list[dict[str, str]]:
     """Get the latest symbols CSV from S3.
     
@@ -356,47 +447,23 @@ def get_latest_symbols_from_s3(bucket: str) -> list[dict[str, str]]:
     # Mock AWS for local testing - return mock data
     if os.getenv("MOCK_AWS") == "true":
         logger.info("Mock AWS: Using mock symbols data for S3 retrieval")
-        mock_csv = """ASX code,Company name,GICS industry group,Market Cap
-BHP,BHP Group Limited,Materials,180500000000
-CBA,Commonwealth Bank,Financials,165200000000
-NAB,National Australia Bank,Financials,98450000000
-WBC,Westpac Banking Corporation,Financials,87320000000
-ANZ,Australia and New Zealand Banking Group,Financials,75690000000
-CSL,CSL Limited,Health Care Equipment & Services,142300000000
-WES,Wesfarmers Limited,Consumer Discretionary Distribution & Retail,68900000000
-WOW,Woolworths Group,Consumer Staples Distribution & Retail,45200000000
-FMG,Fortescue Metals Group,Materials,56800000000
-RIO,Rio Tinto Limited,Materials,134700000000"""
-        return parse_asx_csv(mock_csv)
+        return parse_asx_csv(_MOCK_CSV_BYTES)
     
-    s3_client = boto3.client('s3')
+    s3_client = get_s3_client()
     
     try:
-        # List all files in the symbols prefix
-        response = s3_client.list_objects_v2(
-            Bucket=bucket,
-            Prefix=S3_SYMBOLS_PREFIX
-        )
-        
-        if 'Contents' not in response:
-            raise ASXSymbolUpdaterError(
-                "No symbol files found in S3",
-                details={"bucket": bucket, "prefix": S3_SYMBOLS_PREFIX}
-            )
+        # Keys are date-stamped, so today's file is the latest one when it exists
+        latest_key = get_symbols_s3_key(date.today())
         
-        # Sort by last modified date to get the latest
-        files = sorted(
-            response['Contents'],
-            key=lambda x: x['LastModified'],
-            reverse=True
-        )
+        try:
+            obj = s3_client.get_object(Bucket=bucket, Key=latest_key)
+        except s3_client.exceptions.NoSuchKey:
+            latest_key = _find_latest_symbols_key(s3_client, bucket)
+            obj = s3_client.get_object(Bucket=bucket, Key=latest_key)
         
-        latest_key = files[0]['Key']
         logger.info(f"Latest symbols file: {latest_key}")
         
-        # Download the file
-        obj = s3_client.get_object(Bucket=bucket, Key=latest_key)
-        csv_content = obj['Body'].read().decode('utf-8')
+        csv_content = obj['Body'].read()
         
         # Parse and return
         return parse_asx_csv(csv_content)
@@ -418,14 +485,10 @@ def split_into_batches(symbols: list[str], batch_size: int = BATCH_SIZE) -> list
     Returns:
         List of batch dictionaries for Step Functions
     """
-    batches = []
-    
-    for i in range(0, len(symbols), batch_size):
-        batch_symbols = symbols[i:i + batch_size]
-        batches.append({
-            "symbols": batch_symbols,
-            "batchNumber": i // batch_size
-        })
+    batches = [
+        {"symbols": symbols[start:start + batch_size], "batchNumber": batch_number}
+        for batch_number, start in enumerate(range(0, len(symbols), batch_size))
+    ]
     
     logger.info(
         f"Split {len(symbols)} symbols into {len(batches)} batches",
@@ -442,9 +505,10 @@ def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
     
     This handler:
     1. Downloads the latest ASX companies CSV from the ASX website
-    2. Uploads it to S3 with today's date
-    3. Retrieves the latest file from S3 (the one just uploaded)
-    4. Splits symbols into batches of 100
+       (cached per day across warm invocations)
+    2. Uploads it to S3 with today's date, unless already uploaded today
+    3. Verifies the uploaded file in S3 and reuses the parsed companies
+    4. Splits symbols into batches of BATCH_SIZE (or the event's batchSize)
     5. Returns formatted output for Step Functions
     
     Args:
@@ -454,7 +518,7 @@ def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
     Returns:
         Dictionary with symbols and batches for Step Functions
     """
-    start_time = datetime.utcnow()
+    start_time = time.perf_counter()
     request_id = context.request_id if hasattr(context, "request_id") else "local"
     
     logger.info(
@@ -469,45 +533,73 @@ def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
         if not bucket:
             raise ASXSymbolUpdaterError("S3_BUCKET environment variable not set")
         
+        raw_batch_size = event.get("batchSize", BATCH_SIZE)
+        try:
+            batch_size = int(raw_batch_size)
+        except (TypeError, ValueError):
+            batch_size = 0
+        if batch_size < 1:
+            raise ASXSymbolUpdaterError(
+                "batchSize must be a positive integer",
+                details={"batch_size": raw_batch_size}
+            )
+        
         upload_date = date.today()
         
-        # Step 1: Download CSV from ASX website
-        logger.info("Step 1: Downloading ASX CSV from website")
-        csv_content = download_asx_csv()
-        
-        # Parse to validate
-        companies = parse_asx_csv(csv_content)
-        logger.info(f"Downloaded and parsed {len(companies)} companies")
-        
-        # Step 2: Upload to S3
-        logger.info("Step 2: Uploading CSV to S3")
-        s3_key = upload_to_s3(csv_content, bucket, upload_date)
-        
-        # Step 3: Get the latest file from S3 (the one we just uploaded)
-        # If MOCK_AWS=true, we need to use the real data we downloaded, not mock data
-        logger.info("Step 3: Retrieving latest symbols from S3")
-        if os.getenv("MOCK_AWS") == "true":
-            # In mock AWS mode, use the CSV we just downloaded instead of fetching from S3
-            logger.info("Mock AWS: Using downloaded CSV data instead of S3 retrieval")
-            latest_companies = companies  # Use the companies we already parsed
+        # Step 1: Download CSV from ASX website (once per day per warm container)
+        cached = _CSV_CACHE.get(upload_date)
+        if cached:
+            logger.info("Step 1: Using ASX CSV cached by a previous invocation")
+            csv_content, companies = cached
         else:
-            # Real AWS mode: fetch from S3
-            latest_companies = get_latest_symbols_from_s3(bucket)
+            logger.info("Step 1: Downloading ASX CSV from website")
+            csv_content = download_asx_csv()
+            
+            # Parse to validate
+            companies = parse_asx_csv(csv_content)
+            
+            # Only today's entry is useful, so drop anything older
+            _CSV_CACHE.clear()
+            _CSV_CACHE[upload_date] = (csv_content, companies)
+        
+        logger.info(
+            f"ASX CSV contains {len(companies)} companies",
+            total_companies=len(companies),
+            sample_symbols=[c['symbol'] for c in companies[:5]]
+        )
+        
+        # Step 2: Upload to S3, unless a previous invocation already uploaded
+        # this exact file today
+        csv_size = len(csv_content)
+        s3_key = get_symbols_s3_key(upload_date)
+        
+        if cached and get_s3_object_size(bucket, s3_key) == csv_size:
+            logger.info("Step 2: Symbols file already uploaded today, skipping upload", key=s3_key)
+        else:
+            logger.info("Step 2: Uploading CSV to S3")
+            s3_key = upload_to_s3(csv_content, bucket, upload_date)
+            
+            # Step 3: Verify the upload landed; the symbols come from the companies
+            # already parsed above rather than downloading and parsing the file again
+            logger.info("Step 3: Verifying uploaded symbols file in S3")
+            verify_s3_upload(bucket, s3_key, csv_size)
+        
+        latest_companies = companies
         
         # Extract just the symbols for processing
         symbols = [company['symbol'] for company in latest_companies]
         
         # Step 4: Split into batches for Step Functions
         logger.info("Step 4: Splitting symbols into batches")
-        symbol_batches = split_into_batches(symbols, BATCH_SIZE)
+        symbol_batches = split_into_batches(symbols, batch_size)
         
         # Calculate execution time
-        execution_time = (datetime.utcnow() - start_time).total_seconds()
+        execution_time = time.perf_counter() - start_time
         
         # Prepare response for Step Functions
         response = {
             "statusCode": 200,
-            "body": json.dumps({
+            "body": json_dumps({
                 "message": "ASX symbols updated successfully",
                 "date": str(upload_date),
                 "total_symbols": len(symbols),
@@ -519,10 +611,10 @@ def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
             "symbolBatches": symbol_batches,  # For Step Functions Map state
             "metadata": {
                 "request_id": request_id,
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
                 "total_symbols": len(symbols),
                 "num_batches": len(symbol_batches),
-                "batch_size": BATCH_SIZE,
+                "batch_size": batch_size,
                 "s3_key": s3_key,
                 "execution_time": execution_time
             }
@@ -548,14 +640,14 @@ def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
         
         return {
             "statusCode": 500,
-            "body": json.dumps({
+            "body": json_dumps({
                 "error": type(e).__name__,
                 "message": e.message,
                 "details": e.details
             }),
             "metadata": {
                 "request_id": request_id,
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
                 "error": type(e).__name__
             }
         }
@@ -569,13 +661,13 @@ def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
         
         return {
             "statusCode": 500,
-            "body": json.dumps({
+            "body": json_dumps({
                 "error": "InternalError",
                 "message": str(e)
             }),
             "metadata": {
                 "request_id": request_id,
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
                 "error": "InternalError"
             }
         }
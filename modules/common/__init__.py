@@ -1,7 +1,7 @@
 """Common utilities for stock-stream-2.
 
 This package provides shared functionality including exceptions,
-validators, and logging configuration.
+validators, JSON serialization, and logging configuration.
 
 The logger is automatically configured when this package is imported.
 """
@@ -19,12 +19,15 @@ from .exceptions import (
     StorageError,
     ValidationError,
 )
+from .serialization import json_dumps, json_loads
 from .validators import (
     validate_config,
     validate_dataframe,
     validate_date,
+    validate_ohlcv_dataframe,
     validate_ohlcv_row,
     validate_symbol,
+    validate_symbols_bulk,
 )
 
 __all__ = [
@@ -36,10 +39,15 @@ __all__ = [
     "StorageError",
     "DataFetchError",
     "DataQualityError",
+    # Serialization
+    "json_dumps",
+    "json_loads",
     # Validators
     "validate_symbol",
+    "validate_symbols_bulk",
     "validate_date",
     "validate_ohlcv_row",
+    "validate_ohlcv_dataframe",
     "validate_dataframe",
     "validate_config",
 ]
@@ -0,0 +1,44 @@
+"""JSON serialization helpers for stock-stream-2.
+
+Uses orjson when it is installed and falls back to the standard library
+json module otherwise, so local environments without orjson keep working.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+
+    _HAS_ORJSON = True
+except ImportError:  # pragma: no cover - depends on the environment
+    _HAS_ORJSON = False
+
+
+def json_dumps(obj: Any) -> str:
+    """Serialize an object to a JSON string.
+
+    Args:
+        obj: JSON-serializable object
+
+    Returns:
+        JSON string
+    """
+    if _HAS_ORJSON:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj)
+
+
+def json_loads(data: bytes | str) -> Any:
+    """Parse a JSON document.
+
+    Args:
+        data: JSON as bytes or str; bytes are parsed without an
+            intermediate decode when orjson is available
+
+    Returns:
+        Parsed object
+    """
+    if _HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -2,13 +2,96 @@
 
 import math
 import re
+import string
 from datetime import date, datetime
-from typing import Any
-
-import polars as pl
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
 
 from modules.common.exceptions import ValidationError
 
+# Polars is imported where the DataFrame checks run, so importing this module
+# (e.g. for validate_config on a Lambda cold start) does not load it
+if TYPE_CHECKING:
+    import polars as pl
+
+# 1-5 uppercase alphanumeric characters; \Z (unlike $) rejects a trailing newline
+_SYMBOL_RE = re.compile(r"[A-Z0-9]{1,5}\Z")
+
+# Same rule as a character set, for bulk checks that skip the regex engine
+_SYMBOL_CHARS = frozenset(string.ascii_uppercase + string.digits)
+
+
+def _nan_safe(failed: "pl.Expr", *fields: str) -> "pl.Expr":
+    """Only report a comparison failure when none of its operands is NaN.
+
+    Polars orders NaN above every number, while Python comparisons with NaN
+    are always False; NaN values are reported by the finiteness checks alone.
+    """
+    import polars as pl
+
+    return failed & pl.all_horizontal([pl.col(field).is_not_nan() for field in fields])
+
+
+@lru_cache(maxsize=1)
+def _ohlcv_checks() -> tuple[list[tuple[str, "pl.Expr", str]], "pl.Expr"]:
+    """Build the vectorized OHLCV checks on first use.
+
+    Returns:
+        The vectorized equivalents of the checks in validate_ohlcv_row, each
+        a check name, an expression that is True for rows that fail, and the
+        message template for that failure; and a single predicate that is
+        True for rows failing any check, so the full frame is scanned once
+        without materializing a column per check
+    """
+    import polars as pl
+
+    # Relative open-to-close move; NaN when an operand is NaN or both are infinite
+    price_change = (pl.col("close") - pl.col("open")).abs() / pl.col("open")
+
+    checks: list[tuple[str, pl.Expr, str]] = [
+        *[
+            (f"{field}_positive", pl.col(field) <= 0, f"{field} must be positive: {{{field}}}")
+            for field in ["open", "high", "low", "close"]
+        ],
+        ("volume_non_negative", pl.col("volume") < 0, "volume must be non-negative: {volume}"),
+        (
+            "high_gte_low",
+            _nan_safe(pl.col("high") < pl.col("low"), "high", "low"),
+            "high ({high}) must be >= low ({low})",
+        ),
+        (
+            "high_gte_open",
+            _nan_safe(pl.col("high") < pl.col("open"), "high", "open"),
+            "high ({high}) must be >= open ({open})",
+        ),
+        (
+            "high_gte_close",
+            _nan_safe(pl.col("high") < pl.col("close"), "high", "close"),
+            "high ({high}) must be >= close ({close})",
+        ),
+        (
+            "low_lte_open",
+            _nan_safe(pl.col("low") > pl.col("open"), "low", "open"),
+            "low ({low}) must be <= open ({open})",
+        ),
+        (
+            "low_lte_close",
+            _nan_safe(pl.col("low") > pl.col("close"), "low", "close"),
+            "low ({low}) must be <= close ({close})",
+        ),
+        (
+            "price_change",
+            (pl.col("open") != 0) & (price_change > 0.5) & price_change.is_not_nan(),
+            "Suspicious price change >50%: open={open}, close={close}",
+        ),
+        *[
+            (f"{field}_finite", ~pl.col(field).is_finite(), f"{field} is not finite: {{{field}}}")
+            for field in ["open", "high", "low", "close", "volume"]
+        ],
+    ]
+
+    return checks, pl.any_horizontal([check for _, check, _ in checks])
+
 
 def validate_symbol(symbol: str) -> None:
     """Validate stock symbol format.
@@ -22,18 +105,42 @@ def validate_symbol(symbol: str) -> None:
     if not symbol:
         raise ValidationError("Symbol cannot be empty")
 
-    if not re.match(r"^[A-Z0-9]{1,5}$", symbol):
+    if not _SYMBOL_RE.match(symbol):
         raise ValidationError(
             f"Invalid symbol format: {symbol}. Must be 1-5 uppercase alphanumeric characters",
             details={"symbol": symbol},
         )
 
 
-def validate_date(date_value: date | str) -> date:
+def validate_symbols_bulk(symbols: list[str]) -> None:
+    """Validate a list of stock symbols in one pass.
+
+    Unlike calling validate_symbol in a loop, every invalid symbol is
+    reported in a single error instead of stopping at the first one.
+
+    Args:
+        symbols: Stock symbols to validate
+
+    Raises:
+        ValidationError: If any symbol format is invalid
+    """
+    allowed = _SYMBOL_CHARS.issuperset
+    bad = [s for s in symbols if not (isinstance(s, str) and 0 < len(s) <= 5 and allowed(s))]
+    if bad:
+        raise ValidationError(
+            f"Invalid symbol format: {', '.join(map(str, bad))}. "
+            "Must be 1-5 uppercase alphanumeric characters",
+            details={"symbols": bad},
+        )
+
+
+def validate_date(date_value: date | str, today: date | None = None) -> date:
     """Validate and parse date.
 
     Args:
         date_value: Date to validate (date object or ISO string)
+        today: Reference date for the future-date check; pass it when
+            validating many dates to avoid calling date.today() for each
 
     Returns:
         Validated date object
@@ -50,7 +157,7 @@ def validate_date(date_value: date | str) -> date:
                 details={"date": date_value, "error": str(e)},
             )
 
-    if date_value > date.today():
+    if date_value > (today or date.today()):
         raise ValidationError(
             f"Date cannot be in the future: {date_value}",
             details={"date": str(date_value)},
@@ -82,49 +189,64 @@ def validate_ohlcv_row(row: dict[str, Any]) -> list[str]:
             errors.append(f"Missing required field: {field}")
             return errors  # Can't continue validation without required fields
 
+    open_, high, low, close = row["open"], row["high"], row["low"], row["close"]
+    volume = row["volume"]
+
     # Check non-negative prices
-    for field in ["open", "high", "low", "close"]:
-        if row[field] <= 0:
-            errors.append(f"{field} must be positive: {row[field]}")
+    for field, value in (("open", open_), ("high", high), ("low", low), ("close", close)):
+        if value <= 0:
+            errors.append(f"{field} must be positive: {value}")
 
     # Check volume is non-negative
-    if row["volume"] < 0:
-        errors.append(f"volume must be non-negative: {row['volume']}")
+    if volume < 0:
+        errors.append(f"volume must be non-negative: {volume}")
 
     # Check high/low relationships
-    if row["high"] < row["low"]:
-        errors.append(f"high ({row['high']}) must be >= low ({row['low']})")
+    if high < low:
+        errors.append(f"high ({high}) must be >= low ({low})")
 
-    if row["high"] < row["open"]:
-        errors.append(f"high ({row['high']}) must be >= open ({row['open']})")
+    if high < open_:
+        errors.append(f"high ({high}) must be >= open ({open_})")
 
-    if row["high"] < row["close"]:
-        errors.append(f"high ({row['high']}) must be >= close ({row['close']})")
+    if high < close:
+        errors.append(f"high ({high}) must be >= close ({close})")
 
-    if row["low"] > row["open"]:
-        errors.append(f"low ({row['low']}) must be <= open ({row['open']})")
+    if low > open_:
+        errors.append(f"low ({low}) must be <= open ({open_})")
 
-    if row["low"] > row["close"]:
-        errors.append(f"low ({row['low']}) must be <= close ({row['close']})")
+    if low > close:
+        errors.append(f"low ({low}) must be <= close ({close})")
 
-    # Check for suspicious price changes (>50% in one day)
-    if "open" in row and "close" in row:
-        price_change = abs(row["close"] - row["open"]) / row["open"]
-        if price_change > 0.5:
-            errors.append(
-                f"Suspicious price change >50%: open={row['open']}, close={row['close']}"
-            )
+    # Check for suspicious price changes (>50% in one day); a zero open is
+    # already reported above and would otherwise divide by zero
+    price_change = abs(close - open_) / open_ if open_ else 0.0
+    if price_change > 0.5:
+        errors.append(f"Suspicious price change >50%: open={open_}, close={close}")
 
     # Check for infinities and NaN
-    for field in ["open", "high", "low", "close", "volume"]:
-        value = row[field]
-        if not math.isfinite(value):
-            errors.append(f"{field} is not finite: {value}")
+    values = {"open": open_, "high": high, "low": low, "close": close, "volume": volume}
+    if not all(map(math.isfinite, values.values())):
+        for field, value in values.items():
+            if not math.isfinite(value):
+                errors.append(f"{field} is not finite: {value}")
 
     return errors
 
 
-def validate_dataframe(df: pl.DataFrame) -> list[str]:
+def validate_ohlcv_dataframe(df: "pl.DataFrame") -> "pl.DataFrame":
+    """Run the validate_ohlcv_row checks over every row of a DataFrame.
+
+    Args:
+        df: Polars DataFrame with open, high, low, close and volume columns
+
+    Returns:
+        Boolean DataFrame with one column per check, True where the row passes
+    """
+    checks, _ = _ohlcv_checks()
+    return df.select([(~check).alias(name) for name, check, _ in checks])
+
+
+def validate_dataframe(df: "pl.DataFrame") -> list[str]:
     """Validate a DataFrame of stock data.
 
     Args:
@@ -133,6 +255,8 @@ def validate_dataframe(df: pl.DataFrame) -> list[str]:
     Returns:
         List of validation errors (empty if valid)
     """
+    import polars as pl
+
     errors = []
 
     # Check required columns
@@ -147,16 +271,27 @@ def validate_dataframe(df: pl.DataFrame) -> list[str]:
         errors.append("DataFrame is empty")
         return errors
 
-    # Check for duplicates
-    duplicates = df.select(["symbol", "date"]).is_duplicated().sum()
-    if duplicates > 0:
-        errors.append(f"Found {duplicates} duplicate (symbol, date) pairs")
-
-    # Validate each row
-    for row in df.iter_rows(named=True):
-        row_errors = validate_ohlcv_row(row)
-        if row_errors:
-            errors.extend([f"Row {row.get('symbol', 'unknown')} {row.get('date', 'unknown')}: {e}" for e in row_errors])
+    # Check for duplicates: rows beyond the first for each (symbol, date) key
+    if df.height > 1:
+        unique_keys = df.select(pl.struct(["symbol", "date"]).n_unique()).item()
+        duplicates = df.height - unique_keys
+        if duplicates > 0:
+            errors.append(f"Found {duplicates} duplicate (symbol, date) pairs")
+
+    # Find failing rows with one fused predicate, then evaluate the individual
+    # checks only on that subset to know which messages to emit
+    checks, any_failed = _ohlcv_checks()
+    invalid = df.filter(any_failed)
+    passed = validate_ohlcv_dataframe(invalid)
+
+    for row, results in zip(invalid.iter_rows(named=True), passed.iter_rows(), strict=True):
+        prefix = f"Row {row['symbol']} {row['date']}: "
+        # A null result (missing value) is not reported as a failure
+        errors.extend(
+            prefix + message.format(**row)
+            for (_, _, message), ok in zip(checks, results, strict=True)
+            if ok is False
+        )
 
     return errors
 
@@ -190,6 +325,4 @@ def validate_config(config: dict[str, Any]) -> None:
     if len(config["symbols"]) == 0:
         raise ValidationError("Configuration 'symbols' list is empty")
 
-    # Validate each symbol
-    for symbol in config["symbols"]:
-        validate_symbol(symbol)
+    validate_symbols_bulk(config["symbols"])
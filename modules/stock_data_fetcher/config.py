@@ -1,16 +1,55 @@
 """Configuration management for stock data fetcher."""
 
-import json
 import os
 from typing import Any
 
-import boto3
 from loguru import logger
 
 from modules.common.exceptions import ConfigurationError
 from modules.common import logger as _  # noqa: F401
+from modules.common.serialization import json_loads
 from modules.common.validators import validate_config
 
+# S3 clients shared across warm invocations, keyed by region
+_s3_clients: dict[str, Any] = {}
+
+# Validated symbol lists kept across warm invocations, keyed by (bucket, key)
+# and stored with the ETag they were read at
+_symbols_cache: dict[tuple[str, str], tuple[str, list[str]]] = {}
+
+
+def get_s3_client(region: str) -> Any:
+    """Get the shared S3 client for a region, creating it on first use.
+
+    boto3 is imported here so that a configuration error can be reported
+    without paying for its import on a cold start.
+
+    Args:
+        region: AWS region name
+
+    Returns:
+        Boto3 S3 client
+    """
+    client = _s3_clients.get(region)
+    if client is None:
+        import boto3
+        from botocore.config import Config as BotoConfig
+
+        # Pool sized above the multipart and head_object fan-out in storage
+        client = boto3.client(
+            "s3",
+            region_name=region,
+            config=BotoConfig(
+                max_pool_connections=50,
+                retries={"mode": "adaptive", "max_attempts": 5},
+                tcp_keepalive=True,
+                connect_timeout=3,
+                read_timeout=30,
+            ),
+        )
+        _s3_clients[region] = client
+    return client
+
 
 class Config:
     """Configuration manager for stock data fetcher."""
@@ -35,6 +74,9 @@ class Config:
     def load_symbols_from_s3(self) -> list[str]:
         """Load symbol list from S3 configuration.
 
+        The validated list is cached with its ETag, so warm invocations only
+        re-download and re-validate it when the object has changed.
+
         Returns:
             List of stock symbols
 
@@ -42,17 +84,32 @@ class Config:
             ConfigurationError: If symbols cannot be loaded
         """
         try:
-            s3_client = boto3.client("s3", region_name=self.aws_region)
+            s3_client = get_s3_client(self.aws_region)
             key = f"{self.s3_config_prefix}symbols.json"
 
             logger.info(f"Loading symbols from s3://{self.s3_bucket}/{key}")
 
-            response = s3_client.get_object(Bucket=self.s3_bucket, Key=key)
-            config_data = json.loads(response["Body"].read().decode("utf-8"))
+            # Conditional GET: S3 answers 304 when the cached copy is current
+            cache_key = (self.s3_bucket, key)
+            cached = _symbols_cache.get(cache_key)
+            request: dict[str, Any] = {"Bucket": self.s3_bucket, "Key": key}
+            if cached:
+                request["IfNoneMatch"] = cached[0]
+
+            try:
+                response = s3_client.get_object(**request)
+            except s3_client.exceptions.ClientError as e:
+                if cached and e.response["Error"]["Code"] in ("304", "NotModified"):
+                    logger.info(f"Symbols unchanged, using {len(cached[1])} cached symbols")
+                    return list(cached[1])
+                raise
+
+            config_data = json_loads(response["Body"].read())
 
             validate_config(config_data)
 
             symbols = config_data["symbols"]
+            _symbols_cache[cache_key] = (response["ETag"], list(symbols))
             logger.info(f"Loaded {len(symbols)} symbols from S3")
 
             return symbols
@@ -76,8 +133,8 @@ class Config:
             ConfigurationError: If symbols cannot be loaded
         """
         try:
-            with open(path, "r") as f:
-                config_data = json.load(f)
+            with open(path, "rb") as f:
+                config_data = json_loads(f.read())
 
             validate_config(config_data)
 
@@ -1,16 +1,85 @@
 """Stock data fetcher using Yahoo Finance."""
 
+import random
+import threading
 import time
-from datetime import date, datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
 from typing import Any
 
 import polars as pl
 import yfinance as yf
 from loguru import logger
+from requests.exceptions import HTTPError
+from yfinance.exceptions import YFRateLimitError
 
 from modules.common.exceptions import DataFetchError, RateLimitError
 from modules.common import logger as _  # noqa: F401
-from modules.common.validators import validate_dataframe, validate_symbol
+from modules.common.validators import (
+    validate_dataframe,
+    validate_symbol,
+    validate_symbols_bulk,
+)
+
+HTTP_TOO_MANY_REQUESTS = 429
+FALLBACK_MAX_WORKERS = 8
+
+# yfinance history columns, in the order _history_row unpacks them
+HISTORY_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+# Column dtypes of the frame fetch_multiple_symbols returns
+OHLCV_SCHEMA = {
+    "symbol": pl.Utf8,
+    "date": pl.Date,
+    "open": pl.Float64,
+    "high": pl.Float64,
+    "low": pl.Float64,
+    "close": pl.Float64,
+    "volume": pl.Int64,
+    "adjusted_close": pl.Float64,
+}
+
+
+def _is_rate_limit_error(error: Exception) -> bool:
+    """Check whether an exception raised by yfinance signals throttling.
+
+    Args:
+        error: Exception raised while fetching
+
+    Returns:
+        True if Yahoo Finance responded with HTTP 429
+    """
+    if isinstance(error, YFRateLimitError):
+        return True
+    if isinstance(error, HTTPError) and error.response is not None:
+        return error.response.status_code == HTTP_TOO_MANY_REQUESTS
+    return False
+
+
+def _history_row(symbol: str, data: Any) -> dict[str, Any]:
+    """Build a result row from the first bar of a yfinance history frame.
+
+    Args:
+        symbol: Stock symbol the history belongs to
+        data: Non-empty pandas DataFrame with Open/High/Low/Close/Volume columns
+
+    Returns:
+        Dictionary with OHLCV data
+    """
+    # One row lookup and one numpy conversion instead of a Series indexer per field
+    open_, high, low, close, volume = (
+        data.iloc[0][HISTORY_COLUMNS].to_numpy(dtype=float).tolist()
+    )
+    return {
+        "symbol": symbol,
+        "date": data.index[0].date(),
+        "open": open_,
+        "high": high,
+        "low": low,
+        "close": close,
+        "volume": int(volume),
+        "adjusted_close": close,
+    }
 
 
 class YahooFinanceFetcher:
@@ -37,6 +106,54 @@ class YahooFinanceFetcher:
         self.timeout = timeout
         self.symbols_fetched = 0
         self.symbols_failed = 0
+        self.validation_time = 0.0
+        self._stats_lock = threading.Lock()
+        self._throttle_lock = threading.Lock()
+        self._next_request_at = 0.0
+        # Tickers are reused across retries of a symbol, but only for the
+        # life of this fetcher, so no yfinance session outlives an invocation
+        self._tickers: dict[str, yf.Ticker] = {}
+
+    def _record(self, success: bool) -> None:
+        """Update fetch statistics; safe to call from worker threads."""
+        with self._stats_lock:
+            if success:
+                self.symbols_fetched += 1
+            else:
+                self.symbols_failed += 1
+
+    def _throttle(self) -> None:
+        """Block until the next request slot, spacing requests across threads.
+
+        Requests from all workers are kept at least ``rate_limit_delay``
+        seconds apart.
+        """
+        with self._throttle_lock:
+            wait = self._next_request_at - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self._next_request_at = time.monotonic() + self.rate_limit_delay
+
+    def _get_ticker(self, symbol: str) -> yf.Ticker:
+        """Return this fetcher's Ticker for a symbol, creating it on first use."""
+        ticker = self._tickers.get(symbol)
+        if ticker is None:
+            ticker = self._tickers[symbol] = yf.Ticker(symbol)
+        return ticker
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Compute the jittered exponential backoff for a retry.
+
+        Jitter keeps symbols that were throttled together from retrying in
+        lockstep against the same rate limit.
+
+        Args:
+            attempt: Zero-based attempt number that just failed
+
+        Returns:
+            Seconds to wait before the next attempt
+        """
+        return float(self.retry_delay * (2**attempt) * (0.5 + random.random()))
 
     def fetch_single_symbol(
         self, symbol: str, fetch_date: date | None = None
@@ -55,11 +172,12 @@ class YahooFinanceFetcher:
         """
         validate_symbol(symbol)
 
-        # Determine period
+        # Determine period; yfinance treats end as exclusive, so a single day
+        # is requested as [fetch_date, fetch_date + 1)
         if fetch_date:
             period = "1d"
             start_date = fetch_date
-            end_date = fetch_date
+            end_date = fetch_date + timedelta(days=1)
         else:
             period = "1d"
             start_date = None
@@ -74,7 +192,7 @@ class YahooFinanceFetcher:
                 )
 
                 # Fetch data
-                ticker = yf.Ticker(symbol)
+                ticker = self._get_ticker(symbol)
 
                 if start_date and end_date:
                     data = ticker.history(
@@ -90,36 +208,17 @@ class YahooFinanceFetcher:
 
                 if data.empty:
                     logger.warning(f"No data returned for {symbol}", symbol=symbol)
-                    self.symbols_failed += 1
+                    self._record(False)
                     return None
 
-                # Convert to dictionary
-                result = {
-                    "symbol": symbol,
-                    "date": (
-                        data.index[0].date()
-                        if not data.empty
-                        else fetch_date or date.today()
-                    ),
-                    "open": float(data["Open"].iloc[0]) if not data.empty else 0.0,
-                    "high": float(data["High"].iloc[0]) if not data.empty else 0.0,
-                    "low": float(data["Low"].iloc[0]) if not data.empty else 0.0,
-                    "close": float(data["Close"].iloc[0]) if not data.empty else 0.0,
-                    "volume": int(data["Volume"].iloc[0]) if not data.empty else 0,
-                    "adjusted_close": (
-                        float(data["Close"].iloc[0]) if not data.empty else 0.0
-                    ),
-                }
+                result = _history_row(symbol, data)
 
                 logger.info(f"Successfully fetched {symbol}", symbol=symbol)
-                self.symbols_fetched += 1
+                self._record(True)
                 return result
 
             except Exception as e:
-                error_str = str(e).lower()
-
-                # Check if it's a rate limit error
-                if "429" in error_str or "too many requests" in error_str:
+                if _is_rate_limit_error(e):
                     logger.warning(
                         f"Rate limited on {symbol}, attempt {attempt + 1}",
                         symbol=symbol,
@@ -127,17 +226,16 @@ class YahooFinanceFetcher:
                     )
 
                     if attempt < self.max_retries - 1:
-                        # Exponential backoff
-                        delay = self.retry_delay * (2**attempt)
+                        delay = self._backoff_delay(attempt)
                         logger.info(
-                            f"Waiting {delay}s before retry",
+                            f"Waiting {delay:.1f}s before retry",
                             symbol=symbol,
                             delay=delay,
                         )
                         time.sleep(delay)
                         continue
                     else:
-                        self.symbols_failed += 1
+                        self._record(False)
                         raise RateLimitError(
                             f"Rate limit exceeded for {symbol} after {self.max_retries} attempts",
                             details={"symbol": symbol, "attempts": self.max_retries},
@@ -152,13 +250,13 @@ class YahooFinanceFetcher:
                 )
 
                 if attempt < self.max_retries - 1:
-                    delay = self.retry_delay * (2**attempt)
+                    delay = self._backoff_delay(attempt)
                     logger.info(
-                        f"Retrying {symbol} in {delay}s", symbol=symbol, delay=delay
+                        f"Retrying {symbol} in {delay:.1f}s", symbol=symbol, delay=delay
                     )
                     time.sleep(delay)
                 else:
-                    self.symbols_failed += 1
+                    self._record(False)
                     logger.error(
                         f"Failed to fetch {symbol} after {self.max_retries} attempts",
                         symbol=symbol,
@@ -167,14 +265,83 @@ class YahooFinanceFetcher:
 
         return None
 
+    def _fetch_batch(
+        self, symbols: list[str], fetch_date: date | None
+    ) -> dict[str, dict[str, Any]]:
+        """Fetch many symbols in one yfinance download call.
+
+        Args:
+            symbols: List of stock symbols to fetch
+            fetch_date: Specific date to fetch (None for latest)
+
+        Returns:
+            Mapping of symbol to OHLCV data for every symbol the batch
+            returned data for; failures are left to the per-symbol path
+        """
+        validate_symbols_bulk(symbols)
+
+        window: dict[str, Any]
+        if fetch_date:
+            window = {"start": fetch_date, "end": fetch_date + timedelta(days=1)}
+        else:
+            window = {"period": "1d"}
+
+        try:
+            data = yf.download(
+                symbols,
+                group_by="ticker",
+                threads=True,
+                progress=False,
+                timeout=self.timeout,
+                **window,
+            )
+        except Exception as e:
+            logger.warning(f"Batch download failed: {e}", error=str(e))
+            return {}
+
+        if data is None or data.empty:
+            return {}
+
+        fetched: dict[str, dict[str, Any]] = {}
+        returned = set(data.columns.get_level_values(0))
+        for symbol in symbols:
+            if symbol not in returned:
+                continue
+            history = data[symbol].dropna(how="all")
+            if history.empty:
+                continue
+            try:
+                fetched[symbol] = _history_row(symbol, history)
+            except ValueError as e:
+                # A partially missing bar (e.g. NaN volume) is left to the
+                # per-symbol path rather than failing the whole batch
+                logger.warning(
+                    f"Incomplete batch data for {symbol}: {e}", symbol=symbol, error=str(e)
+                )
+                continue
+            self._record(True)
+
+        logger.info(
+            f"Batch download returned {len(fetched)}/{len(symbols)} symbols",
+            symbols_fetched=len(fetched),
+            total_symbols=len(symbols),
+        )
+        return fetched
+
     def fetch_multiple_symbols(
-        self, symbols: list[str], fetch_date: date | None = None
+        self, symbols: list[str], fetch_date: date | None = None, validate: bool = True
     ) -> pl.DataFrame:
         """Fetch data for multiple symbols with rate limiting.
 
+        Symbols are fetched in a single batch download first; any the batch
+        does not return are retried individually on a small thread pool that
+        shares one rate limit.
+
         Args:
             symbols: List of stock symbols to fetch
             fetch_date: Specific date to fetch (None for latest)
+            validate: Run validate_dataframe on the result; disable when the
+                data is validated by a later step
 
         Returns:
             Polars DataFrame with OHLCV data for all symbols
@@ -182,23 +349,29 @@ class YahooFinanceFetcher:
         Raises:
             DataFetchError: If no symbols could be fetched
         """
-        results = []
-
-        for i, symbol in enumerate(symbols):
-            result = self.fetch_single_symbol(symbol, fetch_date)
+        fetched = self._fetch_batch(symbols, fetch_date)
+
+        # Fall back to per-symbol fetches for anything the batch missed
+        missing = [symbol for symbol in symbols if symbol not in fetched]
+        if missing:
+            logger.info(
+                f"Fetching {len(missing)} symbols individually",
+                missing_count=len(missing),
+            )
 
-            if result:
-                results.append(result)
+            def fetch_throttled(symbol: str) -> dict[str, Any] | None:
+                self._throttle()
+                return self.fetch_single_symbol(symbol, fetch_date)
 
-            # Rate limiting delay (except for last symbol)
-            if i < len(symbols) - 1:
-                logger.debug(
-                    f"Rate limit delay: {self.rate_limit_delay}s",
-                    delay=self.rate_limit_delay,
-                )
-                time.sleep(self.rate_limit_delay)
+            with ThreadPoolExecutor(max_workers=FALLBACK_MAX_WORKERS) as executor:
+                for symbol, result in zip(
+                    missing, executor.map(fetch_throttled, missing), strict=True
+                ):
+                    if result:
+                        fetched[symbol] = result
 
-        if not results:
+        rows = [fetched[symbol] for symbol in symbols if symbol in fetched]
+        if not rows:
             raise DataFetchError(
                 "Failed to fetch data for any symbols",
                 details={
@@ -207,17 +380,23 @@ class YahooFinanceFetcher:
                 },
             )
 
-        # Convert to Polars DataFrame
-        df = pl.DataFrame(results)
+        # The explicit schema fixes the column dtypes and skips inference
+        df = pl.from_dicts(rows, schema=OHLCV_SCHEMA)
 
-        # Validate data
-        errors = validate_dataframe(df)
-        if errors:
-            logger.warning(
-                f"Data validation found {len(errors)} errors",
-                error_count=len(errors),
-                errors=errors[:5],  # Log first 5 errors
+        if validate:
+            validation_start = time.perf_counter()
+            errors = validate_dataframe(df)
+            self.validation_time = time.perf_counter() - validation_start
+            logger.info(
+                f"Validated {len(df)} rows in {self.validation_time:.3f}s",
+                validation_time=self.validation_time,
             )
+            if errors:
+                logger.warning(
+                    f"Data validation found {len(errors)} errors",
+                    error_count=len(errors),
+                    errors=errors[:5],  # Log first 5 errors
+                )
 
         logger.info(
             f"Fetch complete: {self.symbols_fetched} succeeded, {self.symbols_failed} failed",
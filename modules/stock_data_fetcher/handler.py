@@ -2,28 +2,55 @@
 
 import json
 import os
-from datetime import date, datetime
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
 from typing import Any
 
 from loguru import logger
 
 from modules.common.exceptions import StockStreamError
 from modules.common import logger as _  # noqa: F401 - triggers auto-configuration
+from modules.common.serialization import json_dumps
 from modules.stock_data_fetcher.config import Config
-from modules.stock_data_fetcher.fetcher import YahooFinanceFetcher
-from modules.stock_data_fetcher.storage import S3Storage
+
+
+def _build_response(
+    status_code: int, body: dict[str, Any], request_id: str, **metadata: Any
+) -> dict[str, Any]:
+    """Build the Lambda response, serializing the body only at this boundary.
+
+    Args:
+        status_code: HTTP status code
+        body: Response body, serialized to JSON
+        request_id: Lambda request ID
+        **metadata: Extra metadata fields
+
+    Returns:
+        Dictionary with status code, JSON body, and metadata
+    """
+    return {
+        "statusCode": status_code,
+        "body": json_dumps(body),
+        "metadata": {
+            "request_id": request_id,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            **metadata,
+        },
+    }
 
 
 def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
     """AWS Lambda handler for fetching stock data.
 
     Invoked by AWS Step Functions as part of a parallel batch processing workflow.
-    Each invocation processes up to 100 symbols and saves results to S3 as a separate Parquet file.
+    Each invocation processes one batch of symbols (400 by default) and saves results to S3 as
+    a separate Parquet file.
 
     Args:
         event: Step Functions event with the following structure:
             {
-                "symbols": List[str],      # Up to 100 symbols to fetch
+                "symbols": List[str],      # Batch of symbols to fetch
                 "batchNumber": int,        # Batch identifier (0, 1, 2, ...)
                 "date": str (optional)     # ISO date format (YYYY-MM-DD)
             }
@@ -40,27 +67,39 @@ def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
                 "symbols_fetched": int,
                 "symbols_failed": int,
                 "execution_time": float,
+                "validation_time": float,
                 "s3_key": str  # e.g., "raw-data/2025-12-26-batch-0.parquet"
             }
         }
     """
-    start_time = datetime.utcnow()
+    start_time = time.perf_counter()
     request_id = context.request_id if hasattr(context, "request_id") else "local"
     batch_number = event.get("batchNumber", 0)
 
+    # The event carries the whole symbol list; log its size at INFO and leave
+    # the full payload to DEBUG, which loguru skips before serializing anything
     logger.info(
         "Lambda execution started",
         request_id=request_id,
         batch_number=batch_number,
-        event=event,
+        symbol_count=len(event.get("symbols", [])),
+        date=event.get("date"),
     )
+    logger.debug("Lambda event", request_id=request_id, event=event)
 
     try:
         # Load configuration
         config = Config()
-        logger.info("Configuration loaded", config=config.to_dict())
+        # Like the event, the configuration is only logged at DEBUG; lazy=True
+        # keeps to_dict() from running at all when DEBUG is disabled
+        logger.opt(lazy=True).debug("Configuration loaded: {config}", config=config.to_dict)
+
+        # yfinance and boto3 dominate cold-start import time, so they are only
+        # loaded once the configuration is known to be usable
+        from modules.stock_data_fetcher.fetcher import YahooFinanceFetcher
+        from modules.stock_data_fetcher.storage import S3Storage
 
-        # Get symbols from Step Functions event (batch of up to 100)
+        # Get symbols from Step Functions event (one batch)
         if "symbols" in event:
             # Symbols provided by Step Functions
             symbols = event["symbols"]
@@ -83,7 +122,12 @@ def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
         # Get fetch date
         fetch_date_str = event.get("date")
         if fetch_date_str:
-            fetch_date = datetime.fromisoformat(fetch_date_str).date()
+            # Plain YYYY-MM-DD is parsed straight to a date; full timestamps
+            # still go through datetime
+            if len(fetch_date_str) == 10:
+                fetch_date = date.fromisoformat(fetch_date_str)
+            else:
+                fetch_date = datetime.fromisoformat(fetch_date_str).date()
             logger.info(f"Using custom date: {fetch_date}")
         else:
             fetch_date = date.today()
@@ -97,52 +141,50 @@ def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
             timeout=config.yahoo_timeout,
         )
 
-        # Fetch data
+        # Fetch data, building the S3 client in the background meanwhile since
+        # the upload is the only step that needs it
         logger.info(
             f"Fetching data for batch {batch_number}: {len(symbols)} symbols",
             batch_number=batch_number,
             symbol_count=len(symbols)
         )
-        df = fetcher.fetch_multiple_symbols(symbols, fetch_date)
-
-        # Initialize storage
-        storage = S3Storage(
-            bucket=config.s3_bucket,
-            prefix=config.s3_raw_data_prefix,
-            region=config.aws_region,
-        )
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            storage_future = executor.submit(
+                S3Storage,
+                bucket=config.s3_bucket,
+                prefix=config.s3_raw_data_prefix,
+                region=config.aws_region,
+            )
+            df = fetcher.fetch_multiple_symbols(symbols, fetch_date)
+            storage = storage_future.result()
 
         # Upload to S3 with batch number in filename
         s3_key = storage.upload_dataframe(df, fetch_date, batch_number=batch_number)
 
         # Calculate execution time
-        execution_time = (datetime.utcnow() - start_time).total_seconds()
+        execution_time = time.perf_counter() - start_time
 
-        # Prepare response
+        # Prepare response; body and metadata share the batch summary
         stats = fetcher.get_stats()
-        response = {
-            "statusCode": 200,
-            "body": json.dumps({
+        summary = {
+            "batch_number": batch_number,
+            "symbols_processed": stats["total_symbols"],
+            "symbols_fetched": stats["symbols_fetched"],
+            "symbols_failed": stats["symbols_failed"],
+            "s3_key": s3_key,
+            "execution_time": execution_time,
+        }
+        response = _build_response(
+            200,
+            {
                 "message": "Stock data fetched successfully",
                 "date": str(fetch_date),
-                "batch_number": batch_number,
-                "symbols_processed": stats["total_symbols"],
-                "symbols_fetched": stats["symbols_fetched"],
-                "symbols_failed": stats["symbols_failed"],
-                "s3_key": s3_key,
-                "execution_time": execution_time,
-            }),
-            "metadata": {
-                "request_id": request_id,
-                "timestamp": datetime.utcnow().isoformat(),
-                "batch_number": batch_number,
-                "symbols_processed": stats["total_symbols"],
-                "symbols_fetched": stats["symbols_fetched"],
-                "symbols_failed": stats["symbols_failed"],
-                "execution_time": execution_time,
-                "s3_key": s3_key,
+                **summary,
             },
-        }
+            request_id,
+            **summary,
+            validation_time=fetcher.validation_time,
+        )
 
         logger.info(
             "Lambda execution completed successfully",
@@ -163,19 +205,16 @@ def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
             details=e.details,
         )
 
-        return {
-            "statusCode": 500,
-            "body": json.dumps({
+        return _build_response(
+            500,
+            {
                 "error": type(e).__name__,
                 "message": e.message,
                 "details": e.details,
-            }),
-            "metadata": {
-                "request_id": request_id,
-                "timestamp": datetime.utcnow().isoformat(),
-                "error": type(e).__name__,
             },
-        }
+            request_id,
+            error=type(e).__name__,
+        )
 
     except Exception as e:
         logger.critical(
@@ -184,18 +223,12 @@ def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
             error=str(e),
         )
 
-        return {
-            "statusCode": 500,
-            "body": json.dumps({
-                "error": "InternalError",
-                "message": str(e),
-            }),
-            "metadata": {
-                "request_id": request_id,
-                "timestamp": datetime.utcnow().isoformat(),
-                "error": "InternalError",
-            },
-        }
+        return _build_response(
+            500,
+            {"error": "InternalError", "message": str(e)},
+            request_id,
+            error="InternalError",
+        )
 
 
 # For local testing
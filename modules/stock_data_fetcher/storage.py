@@ -1,31 +1,74 @@
 """S3 storage utilities for stock data."""
 
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
-from pathlib import Path
+from io import BytesIO
+from typing import Any, Final
 
-import boto3
 import polars as pl
+from boto3.s3.transfer import TransferConfig
 from loguru import logger
 
 from modules.common.exceptions import StorageError
 from modules.common import logger as _  # noqa: F401
+from modules.stock_data_fetcher.config import get_s3_client
+
+# Objects above the threshold are sent as concurrent multipart uploads. S3
+# requires parts of at least 5 MiB (except the last) and at most 10,000 parts,
+# so 8 MiB parts cover objects up to ~78 GiB while keeping each part small
+# enough for several to be in flight within Lambda's memory.
+S3_MULTIPART_THRESHOLD = 8 * 1024 * 1024
+S3_MULTIPART_CHUNKSIZE = 8 * 1024 * 1024
+S3_MAX_CONCURRENCY = 10
+
+_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=S3_MULTIPART_THRESHOLD,
+    multipart_chunksize=S3_MULTIPART_CHUNKSIZE,
+    max_concurrency=S3_MAX_CONCURRENCY,
+    use_threads=True,
+)
+
+# Parquet writer settings: zstd-3 output is smaller than snappy and decodes
+# as fast, and per-row-group statistics let readers skip row groups
+PARQUET_COMPRESSION: Final = "zstd"
+PARQUET_COMPRESSION_LEVEL = 3
+PARQUET_ROW_GROUP_SIZE = 50_000
+
+# Length of the ISO date that starts each file name under the prefix
+DATE_KEY_LENGTH = len("YYYY-MM-DD")
+
+# Parallel head_object requests when probing keys that share no prefix
+HEAD_OBJECT_MAX_WORKERS = 16
+
+# Parallel uploads in upload_dataframes_batch
+UPLOAD_MAX_WORKERS = 16
 
 
 class S3Storage:
     """Handles storage of stock data to S3 in Parquet format."""
 
-    def __init__(self, bucket: str, prefix: str = "raw-data/", region: str = "ap-southeast-2") -> None:
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = "raw-data/",
+        region: str = "ap-southeast-2",
+        s3_client: Any | None = None,
+    ) -> None:
         """Initialize S3 storage.
 
         Args:
             bucket: S3 bucket name
             prefix: S3 key prefix for data files
             region: AWS region
+            s3_client: Boto3 S3 client to use instead of the shared one
+                for the region
         """
         self.bucket = bucket
         self.prefix = prefix.rstrip("/") + "/"
         self.region = region
-        self.s3_client = boto3.client("s3", region_name=region)
+        # Shared per region, so warm invocations skip client construction
+        self.s3_client = s3_client or get_s3_client(region)
 
     def upload_dataframe(
         self, df: pl.DataFrame, upload_date: date | None = None, batch_number: int | None = None
@@ -43,17 +86,18 @@ class S3Storage:
         Raises:
             StorageError: If upload fails
         """
-        if df.height == 0:
+        if df.is_empty():
             raise StorageError("Cannot upload empty DataFrame")
 
         # Use provided date or today's date
         file_date = upload_date or date.today()
+        file_date_iso = file_date.isoformat()
         
         # Create filename with optional batch number
         if batch_number is not None:
-            filename = f"{file_date.isoformat()}-batch-{batch_number}.parquet"
+            filename = f"{file_date_iso}-batch-{batch_number}.parquet"
         else:
-            filename = f"{file_date.isoformat()}.parquet"
+            filename = f"{file_date_iso}.parquet"
         
         s3_key = f"{self.prefix}{filename}"
 
@@ -62,13 +106,19 @@ class S3Storage:
             logger.info(
                 f"Writing {df.height} rows to Parquet format",
                 rows=df.height,
-                date=str(file_date),
+                date=file_date_iso,
                 batch_number=batch_number,
             )
 
-            # Write to temporary file first
-            temp_path = f"/tmp/{filename}"
-            df.write_parquet(temp_path, compression="snappy")
+            buffer = BytesIO()
+            df.write_parquet(
+                buffer,
+                compression=PARQUET_COMPRESSION,
+                compression_level=PARQUET_COMPRESSION_LEVEL,
+                statistics=True,
+                row_group_size=PARQUET_ROW_GROUP_SIZE,
+            )
+            buffer.seek(0)
 
             # Upload to S3
             logger.info(
@@ -77,10 +127,10 @@ class S3Storage:
                 key=s3_key,
             )
 
-            self.s3_client.upload_file(temp_path, self.bucket, s3_key)
-
-            # Clean up temp file
-            Path(temp_path).unlink(missing_ok=True)
+            # Stream the in-memory Parquet straight to S3, skipping /tmp
+            self.s3_client.upload_fileobj(
+                buffer, self.bucket, s3_key, Config=_TRANSFER_CONFIG
+            )
 
             logger.info(
                 f"Successfully uploaded to S3",
@@ -102,6 +152,40 @@ class S3Storage:
                 },
             )
 
+    def upload_dataframes_batch(
+        self,
+        dfs: list[pl.DataFrame],
+        upload_date: date | None = None,
+        max_workers: int = UPLOAD_MAX_WORKERS,
+    ) -> list[str]:
+        """Upload several DataFrames to S3 concurrently, one file per batch.
+
+        DataFrame i is uploaded as batch i, exactly as upload_dataframe would.
+        Parquet encoding and the S3 requests both release the GIL, so the
+        uploads overlap instead of paying each request's latency in turn.
+
+        Args:
+            dfs: Polars DataFrames with stock data
+            upload_date: Date for the files (defaults to today)
+            max_workers: Maximum number of concurrent uploads
+
+        Returns:
+            S3 keys of the uploaded files, in the order of dfs
+
+        Raises:
+            StorageError: If any upload fails; other batches may still have
+                been uploaded
+        """
+        file_date = upload_date or date.today()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(
+                executor.map(
+                    lambda item: self.upload_dataframe(item[1], file_date, item[0]),
+                    enumerate(dfs),
+                )
+            )
+
     def upload_local_file(self, file_path: str, s3_key: str) -> None:
         """Upload a local Parquet file to S3.
 
@@ -120,7 +204,9 @@ class S3Storage:
                 key=s3_key,
             )
 
-            self.s3_client.upload_file(file_path, self.bucket, s3_key)
+            self.s3_client.upload_file(
+                file_path, self.bucket, s3_key, Config=_TRANSFER_CONFIG
+            )
 
             logger.info(f"Successfully uploaded {file_path} to S3", file_path=file_path)
 
@@ -135,6 +221,34 @@ class S3Storage:
                 },
             )
 
+    def list_files(self, prefix: str) -> list[str]:
+        """List the keys of all files under a prefix.
+
+        Listings are paginated, so prefixes holding more than the 1,000 keys
+        a single list_objects_v2 call returns are listed in full.
+
+        Args:
+            prefix: S3 key prefix to list
+
+        Returns:
+            S3 keys under the prefix
+
+        Raises:
+            StorageError: If listing fails
+        """
+        try:
+            paginator = self.s3_client.get_paginator("list_objects_v2")
+            return [
+                obj["Key"]
+                for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix)
+                for obj in page.get("Contents", [])
+            ]
+        except Exception as e:
+            raise StorageError(
+                f"Failed to list files in S3: {str(e)}",
+                details={"bucket": self.bucket, "prefix": prefix, "error": str(e)},
+            )
+
     def file_exists(self, s3_key: str) -> bool:
         """Check if file exists in S3.
 
@@ -150,11 +264,51 @@ class S3Storage:
         except Exception:
             return False
 
-    def download_dataframe(self, s3_key: str) -> pl.DataFrame:
+    def files_exist(self, s3_keys: list[str]) -> dict[str, bool]:
+        """Check which of several files exist in S3.
+
+        Keys for a single date (e.g. its batch files) are resolved with a
+        paginated listing of their common prefix instead of one head_object
+        request per key. Keys spanning several dates, whose common prefix
+        would cover much of the history, or a listing that fails, fall back
+        to concurrent head_object requests.
+
+        Args:
+            s3_keys: S3 keys to check
+
+        Returns:
+            Mapping of each key to True if it exists, False otherwise
+        """
+        if not s3_keys:
+            return {}
+
+        prefix = os.path.commonprefix(s3_keys)
+        if prefix.startswith(self.prefix) and len(prefix) >= len(self.prefix) + DATE_KEY_LENGTH:
+            try:
+                existing = set(self.list_files(prefix))
+                return {key: key in existing for key in s3_keys}
+            except Exception as e:
+                logger.warning(
+                    f"Listing s3://{self.bucket}/{prefix} failed, checking keys individually",
+                    error=str(e),
+                )
+
+        with ThreadPoolExecutor(max_workers=HEAD_OBJECT_MAX_WORKERS) as executor:
+            return dict(zip(s3_keys, executor.map(self.file_exists, s3_keys), strict=True))
+
+    def download_dataframe(
+        self,
+        s3_key: str,
+        columns: list[str] | None = None,
+        predicate: pl.Expr | None = None,
+    ) -> pl.DataFrame:
         """Download Parquet file from S3 and return as DataFrame.
 
         Args:
             s3_key: S3 key of Parquet file
+            columns: Only decode these columns (None for all)
+            predicate: Only keep rows matching this expression (None for all);
+                it may only reference columns that are being read
 
         Returns:
             Polars DataFrame
@@ -169,15 +323,18 @@ class S3Storage:
                 key=s3_key,
             )
 
-            # Download to temporary file
-            temp_path = f"/tmp/download_{Path(s3_key).name}"
-            self.s3_client.download_file(self.bucket, s3_key, temp_path)
-
-            # Read Parquet file
-            df = pl.read_parquet(temp_path)
+            # Download into memory; objects above the multipart threshold are
+            # fetched as concurrent ranged GETs
+            buffer = BytesIO()
+            self.s3_client.download_fileobj(
+                self.bucket, s3_key, buffer, Config=_TRANSFER_CONFIG
+            )
+            buffer.seek(0)
 
-            # Clean up
-            Path(temp_path).unlink(missing_ok=True)
+            # Decoding only the requested columns skips the rest of each row group
+            df = pl.read_parquet(buffer, columns=columns)
+            if predicate is not None:
+                df = df.filter(predicate)
 
             logger.info(
                 f"Successfully downloaded {df.height} rows",
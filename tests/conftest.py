@@ -26,24 +26,33 @@ def test_data_dir(project_root: Path) -> Path:
     return test_dir
 
 
+# AWS credentials every test runs with, so nothing reaches a real account
+TEST_AWS_ENV = {
+    "AWS_DEFAULT_REGION": "us-east-1",
+    "AWS_ACCESS_KEY_ID": "testing",
+    "AWS_SECRET_ACCESS_KEY": "testing",
+    "AWS_SECURITY_TOKEN": "testing",
+    "AWS_SESSION_TOKEN": "testing",
+}
+
+
 @pytest.fixture(autouse=True)
-def reset_environment():
-    """Reset environment variables before each test."""
-    # Save original environment
+def reset_environment(monkeypatch):
+    """Set the test AWS environment variables for each test.
+
+    Only these keys are patched; monkeypatch restores them afterwards.
+    """
+    for key, value in TEST_AWS_ENV.items():
+        monkeypatch.setenv(key, value)
+
+
+@pytest.fixture
+def isolated_environment():
+    """Restore the whole environment after a test that mutates it freely."""
     original_env = dict(os.environ)
-    
-    # Set default test environment variables
-    os.environ.update({
-        "AWS_DEFAULT_REGION": "us-east-1",
-        "AWS_ACCESS_KEY_ID": "testing",
-        "AWS_SECRET_ACCESS_KEY": "testing",
-        "AWS_SECURITY_TOKEN": "testing",
-        "AWS_SESSION_TOKEN": "testing",
-    })
-    
+
     yield
-    
-    # Restore original environment
+
     os.environ.clear()
     os.environ.update(original_env)
 
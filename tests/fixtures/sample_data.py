@@ -6,7 +6,7 @@ import polars as pl
 import pytest
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_ohlcv_data() -> list[dict]:
     """Sample OHLCV data for testing."""
     return [
@@ -43,13 +43,13 @@ def sample_ohlcv_data() -> list[dict]:
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_dataframe(sample_ohlcv_data: list[dict]) -> pl.DataFrame:
     """Sample DataFrame for testing."""
     return pl.DataFrame(sample_ohlcv_data)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_config() -> dict:
     """Sample configuration for testing."""
     return {
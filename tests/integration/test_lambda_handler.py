@@ -2,164 +2,202 @@
 
 import json
 from datetime import date
-from unittest.mock import patch
+from io import BytesIO
+from itertools import chain, repeat
+from unittest.mock import Mock, patch
 
+import pandas as pd
 import polars as pl
 import pytest
-from moto import mock_aws
+import requests
+from yfinance import Ticker
 
+from modules.common.serialization import json_loads
+from modules.stock_data_fetcher import config as fetcher_config
 from modules.stock_data_fetcher.handler import lambda_handler
 
+LAMBDA_ENV = {
+    "S3_BUCKET_NAME": "test-stock-data",
+    "AWS_REGION": "us-east-1",
+    "YAHOO_FINANCE_TIMEOUT": "60",
+    "YAHOO_FINANCE_RATE_LIMIT_DELAY": "0",
+    "YAHOO_FINANCE_RETRY_DELAY": "0",
+    "YAHOO_FINANCE_MAX_RETRIES": "2",
+}
 
-@mock_aws
-class TestLambdaHandler:
-    """Integration tests for Lambda handler."""
+# The threaded server needs the moto[server] extra (flask)
+ThreadedMotoServer = pytest.importorskip("moto.server").ThreadedMotoServer
 
-    @pytest.fixture(autouse=True)
-    def setup_aws(self):
-        """Set up AWS mocks."""
-        import boto3
-
-        # Create S3 bucket
-        s3 = boto3.client("s3", region_name="us-east-1")
-        s3.create_bucket(Bucket="test-stock-data")
-        
-        # Upload mock config
-        config = {"symbols": ["BHP", "CBA", "NAB"]}
-        s3.put_object(
-            Bucket="test-stock-data",
-            Key="config/symbols.json",
-            Body=json.dumps(config).encode("utf-8"),
-        )
 
-    @patch.dict(
-        "os.environ",
-        {
-            "S3_BUCKET": "test-stock-data",
-            "SYMBOLS_CONFIG_KEY": "config/symbols.json",
-            "YAHOO_FINANCE_TIMEOUT": "60",
-            "RATE_LIMIT_DELAY": "0.1",
-            "MAX_RETRIES": "2",
-        },
+def parse_body(response: dict) -> dict:
+    """Decode the JSON body of a Lambda handler response."""
+    return json_loads(response["body"])
+
+
+@pytest.fixture(scope="module")
+def moto_endpoint():
+    """Run one moto server for the whole module and point S3 clients at it."""
+    server = ThreadedMotoServer(port=0)
+    server.start()
+    host, port = server.get_host_and_port()
+    endpoint = f"http://{host}:{port}"
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("AWS_ENDPOINT_URL_S3", endpoint)
+        yield endpoint
+
+    server.stop()
+
+
+@pytest.fixture(autouse=True)
+def reset_s3_fixture(moto_endpoint, monkeypatch):
+    """Reset the moto backend and recreate the bucket and symbol config."""
+    import boto3
+
+    requests.post(f"{moto_endpoint}/moto-api/reset", timeout=5)
+
+    # Clients cached by earlier tests would still point at the old backend
+    monkeypatch.setattr(fetcher_config, "_s3_clients", {})
+    monkeypatch.setattr(fetcher_config, "_symbols_cache", {})
+
+    s3 = boto3.client("s3", region_name="us-east-1")
+    s3.create_bucket(Bucket="test-stock-data")
+
+    config = {"symbols": ["BHP", "CBA", "NAB"]}
+    s3.put_object(
+        Bucket="test-stock-data",
+        Key="config/symbols.json",
+        Body=json.dumps(config).encode("utf-8"),
     )
-    @patch("yfinance.Ticker")
-    def test_lambda_handler_success(self, mock_ticker_class):
-        """Test successful Lambda execution."""
-        # Setup mock ticker
-        mock_df = pl.DataFrame(
-            {
-                "Date": [date(2024, 12, 25)],
-                "Open": [50.0],
-                "High": [52.0],
-                "Low": [49.0],
-                "Close": [51.0],
-                "Volume": [1000000],
-                "Adj Close": [51.0],
-            }
-        ).to_pandas()
-        
-        from unittest.mock import MagicMock
-        mock_ticker = MagicMock()
-        mock_ticker.history.return_value = mock_df
-        mock_ticker_class.return_value = mock_ticker
-
-        # Create event
-        event = {
-            "start_date": "2024-12-25",
-            "end_date": "2024-12-26",
+
+
+@pytest.fixture(autouse=True)
+def lambda_env(monkeypatch):
+    """Apply the handler environment to every test in the module."""
+    for key, value in LAMBDA_ENV.items():
+        monkeypatch.setenv(key, value)
+
+
+@pytest.fixture(scope="module")
+def mock_history():
+    """One day of Ticker.history() output, converted to pandas once."""
+    return pl.DataFrame(
+        {
+            "Date": [date(2024, 12, 25)],
+            "Open": [50.0],
+            "High": [52.0],
+            "Low": [49.0],
+            "Close": [51.0],
+            "Volume": [1000000],
+            "Adj Close": [51.0],
         }
+    ).to_pandas().set_index("Date")
+
+
+@pytest.fixture
+def mock_ticker_factory(mock_history):
+    """Build Ticker mocks whose history() fails for the first few calls."""
+
+    def _make(failures: int = 0) -> Mock:
+        mock_ticker = Mock(spec=Ticker)
+        mock_ticker.history.side_effect = chain(
+            [Exception("Network error")] * failures, repeat(mock_history)
+        )
+        return mock_ticker
+
+    return _make
+
+
+@pytest.fixture(autouse=True)
+def mock_ticker_class():
+    """Patch yfinance with an empty batch download, so every symbol falls back to a Ticker."""
+    with (
+        patch("modules.stock_data_fetcher.fetcher.yf.download", return_value=pd.DataFrame()),
+        patch("modules.stock_data_fetcher.fetcher.yf.Ticker") as mock_ticker_class,
+    ):
+        yield mock_ticker_class
 
-        # Execute
+
+def read_uploaded(s3_key: str) -> pl.DataFrame:
+    """Read a Parquet file the handler uploaded to the moto bucket."""
+    import boto3
+
+    s3 = boto3.client("s3", region_name="us-east-1")
+    obj = s3.get_object(Bucket="test-stock-data", Key=s3_key)
+    return pl.read_parquet(BytesIO(obj["Body"].read()))
+
+
+class TestLambdaHandler:
+    """Integration tests for Lambda handler."""
+
+    @pytest.mark.parametrize(
+        ("max_retries", "failing"),
+        [
+            pytest.param("2", set(), id="success"),
+            pytest.param("1", {"BHP"}, id="partial_failure"),
+        ],
+    )
+    def test_lambda_handler_fetch(
+        self, mock_ticker_class, mock_ticker_factory, monkeypatch, max_retries, failing
+    ):
+        """Test Lambda execution with and without symbol failures."""
+        monkeypatch.setenv("YAHOO_FINANCE_MAX_RETRIES", max_retries)
+        # Each symbol gets its own Ticker, so the failure stays with its symbol
+        # whichever fallback worker picks it up
+        mock_ticker_class.side_effect = lambda symbol: mock_ticker_factory(
+            1 if symbol in failing else 0
+        )
+
+        event = {"symbols": ["BHP", "CBA", "NAB"], "date": "2024-12-25", "batchNumber": 1}
         response = lambda_handler(event, None)
 
-        # Verify
         assert response["statusCode"] == 200
-        body = json.loads(response["body"])
-        assert body["status"] == "success"
+        body = parse_body(response)
+        assert body["date"] == "2024-12-25"
+        assert body["s3_key"] == "raw-data/2024-12-25-batch-1.parquet"
         assert body["symbols_processed"] == 3
+        # A failing symbol exhausts its retries; the rest still succeed
+        assert body["symbols_failed"] == len(failing)
+        assert body["symbols_fetched"] == 3 - len(failing)
 
-    @patch.dict(
-        "os.environ",
-        {
-            "S3_BUCKET": "test-stock-data",
-            "SYMBOLS_CONFIG_KEY": "config/symbols.json",
-            "YAHOO_FINANCE_TIMEOUT": "60",
-            "RATE_LIMIT_DELAY": "0.1",
-            "MAX_RETRIES": "2",
-        },
-    )
-    def test_lambda_handler_missing_dates(self):
-        """Test Lambda with missing date parameters."""
-        event = {}  # No dates provided
+        uploaded = read_uploaded(body["s3_key"])
+        assert uploaded["symbol"].to_list() == [
+            symbol for symbol in ["BHP", "CBA", "NAB"] if symbol not in failing
+        ]
+
+    def test_lambda_handler_missing_date(self, mock_ticker_class, mock_ticker_factory):
+        """Test Lambda without a date parameter."""
+        mock_ticker_class.return_value = mock_ticker_factory()
+
+        event = {"symbols": ["BHP"]}  # No date provided
         response = lambda_handler(event, None)
 
-        # Should use default dates (today)
+        # Should use the default date (today) and batch 0
         assert response["statusCode"] == 200
-        body = json.loads(response["body"])
-        assert "start_date" in body
-        assert "end_date" in body
+        body = parse_body(response)
+        assert body["date"] == str(date.today())
+        assert body["s3_key"] == f"raw-data/{date.today().isoformat()}-batch-0.parquet"
 
-    @patch.dict("os.environ", {"S3_BUCKET": "test-stock-data"})
-    def test_lambda_handler_invalid_config(self):
-        """Test Lambda with invalid configuration."""
-        import boto3
+    def test_lambda_handler_symbols_from_config(self, mock_ticker_class, mock_ticker_factory):
+        """Test Lambda loading symbols from the S3 config when the event has none."""
+        mock_ticker_class.return_value = mock_ticker_factory()
 
-        # Remove config file
-        s3 = boto3.client("s3", region_name="us-east-1")
-        s3.delete_object(Bucket="test-stock-data", Key="config/symbols.json")
+        response = lambda_handler({"date": "2024-12-25"}, None)
 
-        event = {"start_date": "2024-12-25", "end_date": "2024-12-26"}
-        response = lambda_handler(event, None)
+        assert response["statusCode"] == 200
+        body = parse_body(response)
+        assert body["symbols_processed"] == 3
+        assert read_uploaded(body["s3_key"])["symbol"].to_list() == ["BHP", "CBA", "NAB"]
 
-        # Should return error
-        assert response["statusCode"] == 500
-        body = json.loads(response["body"])
-        assert body["status"] == "error"
+    def test_lambda_handler_invalid_config(self, monkeypatch):
+        """Test Lambda with invalid configuration."""
+        monkeypatch.delenv("S3_BUCKET_NAME")
 
-    @patch.dict(
-        "os.environ",
-        {
-            "S3_BUCKET": "test-stock-data",
-            "SYMBOLS_CONFIG_KEY": "config/symbols.json",
-            "YAHOO_FINANCE_TIMEOUT": "60",
-            "RATE_LIMIT_DELAY": "0.1",
-            "MAX_RETRIES": "1",
-        },
-    )
-    @patch("yfinance.Ticker")
-    def test_lambda_handler_partial_failure(self, mock_ticker_class):
-        """Test Lambda with some symbol failures."""
-        from unittest.mock import MagicMock
-        
-        # Setup mock to fail for first symbol, succeed for others
-        mock_ticker = MagicMock()
-        call_count = 0
-        
-        def history_side_effect(*args, **kwargs):
-            nonlocal call_count
-            call_count += 1
-            if call_count == 1:
-                raise Exception("Network error")
-            return pl.DataFrame(
-                {
-                    "Date": [date(2024, 12, 25)],
-                    "Open": [50.0],
-                    "High": [52.0],
-                    "Low": [49.0],
-                    "Close": [51.0],
-                    "Volume": [1000000],
-                    "Adj Close": [51.0],
-                }
-            ).to_pandas()
-        
-        mock_ticker.history.side_effect = history_side_effect
-        mock_ticker_class.return_value = mock_ticker
-
-        event = {"start_date": "2024-12-25", "end_date": "2024-12-26"}
+        event = {"symbols": ["BHP"], "date": "2024-12-25"}
         response = lambda_handler(event, None)
 
-        # Should still succeed but with errors reported
-        assert response["statusCode"] == 200
-        body = json.loads(response["body"])
-        assert body["symbols_processed"] < 3
-        assert "errors" in body
+        # Should return error
+        assert response["statusCode"] == 500
+        body = parse_body(response)
+        assert body["error"] == "ConfigurationError"
+        assert "S3_BUCKET_NAME" in body["message"]
@@ -0,0 +1,204 @@
+"""Unit tests for the ASX symbol updater handler."""
+
+from collections.abc import Iterator
+from datetime import date
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from moto import mock_aws
+
+from modules.asx_symbol_updater import handler
+from modules.asx_symbol_updater.handler import (
+    ASXSymbolUpdaterError,
+    _find_column,
+    get_symbols_s3_key,
+    lambda_handler,
+    parse_asx_csv,
+    verify_s3_upload,
+)
+
+BUCKET = "test-bucket"
+
+
+class TestParseAsxCsv:
+    """Tests for parsing the ASX companies CSV."""
+
+    def test_header_after_preamble(self) -> None:
+        """Test that lines before the header row are skipped."""
+        csv_content = (
+            b"ASX listed companies as at Fri Dec 26 2025\n"
+            b"\n"
+            b"ASX code,Company name,GICS industry group,Market Cap\n"
+            b"BHP,BHP Group Limited,Materials,180500000000\n"
+        )
+
+        assert parse_asx_csv(csv_content) == [
+            {
+                "symbol": "BHP",
+                "name": "BHP Group Limited",
+                "sector": "Materials",
+                "market_cap": "180500000000",
+            }
+        ]
+
+    def test_header_outside_search_window(self) -> None:
+        """Test that a header below the first lines is not searched for."""
+        preamble = b"preamble\n" * handler.CSV_HEADER_SEARCH_LINES
+        csv_content = preamble + b"ASX code,Company name\nBHP,BHP Group Limited\n"
+
+        with pytest.raises(ASXSymbolUpdaterError, match="No companies found"):
+            parse_asx_csv(csv_content)
+
+    def test_utf8_bom(self) -> None:
+        """Test that a leading byte order mark does not hide the first column."""
+        csv_content = b"\xef\xbb\xbfASX code,Company name\nCBA,Commonwealth Bank\n"
+
+        companies = parse_asx_csv(csv_content)
+
+        assert companies[0]["symbol"] == "CBA"
+        assert companies[0]["sector"] == "Unknown"
+
+    def test_returns_independent_copies(self) -> None:
+        """Test that modifying a result does not change later results."""
+        csv_content = b"Code,Name\nNAB,National Australia Bank\nWBC,Westpac\n"
+
+        first = parse_asx_csv(csv_content)
+        first[0]["symbol"] = "XXX"
+        first.pop()
+
+        assert [c["symbol"] for c in parse_asx_csv(csv_content)] == ["NAB", "WBC"]
+
+
+class TestFindColumn:
+    """Tests for resolving CSV columns from their aliases."""
+
+    def test_first_alias_wins(self) -> None:
+        """Test that aliases are tried in order of preference."""
+        header = ["Symbol", "ASX code", "Company name"]
+
+        assert _find_column(header, handler.SYMBOL_COLUMNS) == 1
+
+    def test_missing_column(self) -> None:
+        """Test that None is returned when no alias is present."""
+        assert _find_column(["ASX code"], handler.MARKET_CAP_COLUMNS) is None
+
+
+class TestS3Helpers:
+    """Tests for the S3 upload verification helpers."""
+
+    @pytest.fixture
+    def s3_client(self, monkeypatch: pytest.MonkeyPatch) -> Iterator[Any]:
+        """Create a moto bucket and point the handler's shared client at it."""
+        monkeypatch.delenv("MOCK_AWS", raising=False)
+
+        with mock_aws():
+            monkeypatch.setattr(handler, "_s3_client", None)
+            client = handler.get_s3_client()
+            client.create_bucket(Bucket=BUCKET)
+            yield client
+
+    def test_verify_matching_upload(self, s3_client: Any) -> None:
+        """Test that an object of the expected size passes verification."""
+        s3_client.put_object(Bucket=BUCKET, Key="symbols/a.csv", Body=b"abc")
+
+        verify_s3_upload(BUCKET, "symbols/a.csv", 3)
+
+    def test_verify_size_mismatch(self, s3_client: Any) -> None:
+        """Test that an object of another size fails verification."""
+        s3_client.put_object(Bucket=BUCKET, Key="symbols/a.csv", Body=b"abc")
+
+        with pytest.raises(ASXSymbolUpdaterError) as exc_info:
+            verify_s3_upload(BUCKET, "symbols/a.csv", 4)
+
+        assert exc_info.value.details["actual_size"] == 3
+
+    def test_verify_missing_upload(self, s3_client: Any) -> None:
+        """Test that a missing object fails verification."""
+        with pytest.raises(ASXSymbolUpdaterError) as exc_info:
+            verify_s3_upload(BUCKET, "symbols/missing.csv", 3)
+
+        assert exc_info.value.details["actual_size"] is None
+
+
+class TestLambdaHandler:
+    """Tests for the handler's per-day CSV cache and upload skipping."""
+
+    @pytest.fixture
+    def s3_client(self, monkeypatch: pytest.MonkeyPatch) -> Iterator[Any]:
+        """Create a moto bucket and serve the mock ASX CSV."""
+        monkeypatch.setenv("S3_BUCKET", BUCKET)
+        monkeypatch.setenv("MOCK_ASX_SOURCE", "true")
+        monkeypatch.delenv("MOCK_AWS", raising=False)
+        monkeypatch.setattr(handler, "_CSV_CACHE", {})
+
+        with mock_aws():
+            monkeypatch.setattr(handler, "_s3_client", None)
+            client = handler.get_s3_client()
+            client.create_bucket(Bucket=BUCKET)
+            yield client
+
+    def test_cache_miss_downloads_and_uploads(self, s3_client: Any) -> None:
+        """Test that a cold invocation downloads, caches and uploads the CSV."""
+        with patch.object(
+            handler, "download_asx_csv", wraps=handler.download_asx_csv
+        ) as mock_download:
+            response = lambda_handler({}, None)
+
+        assert response["statusCode"] == 200
+        assert response["symbols"][:2] == ["BHP", "CBA"]
+        mock_download.assert_called_once()
+        assert list(handler._CSV_CACHE) == [date.today()]
+
+        key = get_symbols_s3_key(date.today())
+        obj = s3_client.get_object(Bucket=BUCKET, Key=key)
+        assert obj["Body"].read() == handler._MOCK_CSV_BYTES
+
+    def test_stale_cache_entry_is_replaced(self, s3_client: Any) -> None:
+        """Test that an entry from a previous day is not reused."""
+        handler._CSV_CACHE[date(2000, 1, 1)] = (b"old", [])
+
+        with patch.object(
+            handler, "download_asx_csv", wraps=handler.download_asx_csv
+        ) as mock_download:
+            lambda_handler({}, None)
+
+        mock_download.assert_called_once()
+        assert list(handler._CSV_CACHE) == [date.today()]
+
+    def test_cache_hit_skips_download_and_upload(self, s3_client: Any) -> None:
+        """Test that a warm invocation reuses the CSV and the uploaded file."""
+        lambda_handler({}, None)
+
+        with (
+            patch.object(handler, "download_asx_csv") as mock_download,
+            patch.object(handler, "upload_to_s3") as mock_upload,
+        ):
+            response = lambda_handler({"batchSize": 4}, None)
+
+        assert response["statusCode"] == 200
+        assert response["metadata"]["num_batches"] == 3
+        mock_download.assert_not_called()
+        mock_upload.assert_not_called()
+
+    def test_cache_hit_reuploads_changed_object(self, s3_client: Any) -> None:
+        """Test that a cached CSV is uploaded again when the S3 copy differs."""
+        lambda_handler({}, None)
+        key = get_symbols_s3_key(date.today())
+        s3_client.put_object(Bucket=BUCKET, Key=key, Body=b"truncated")
+
+        with patch.object(handler, "upload_to_s3", wraps=handler.upload_to_s3) as mock_upload:
+            response = lambda_handler({}, None)
+
+        assert response["statusCode"] == 200
+        mock_upload.assert_called_once()
+        obj = s3_client.get_object(Bucket=BUCKET, Key=key)
+        assert obj["Body"].read() == handler._MOCK_CSV_BYTES
+
+    @pytest.mark.parametrize("batch_size", ["abc", None, 0])
+    def test_invalid_batch_size(self, s3_client: Any, batch_size: Any) -> None:
+        """Test that an invalid batchSize is reported as a handler error."""
+        response = lambda_handler({"batchSize": batch_size}, None)
+
+        assert response["statusCode"] == 500
+        assert "batchSize must be a positive integer" in response["body"]
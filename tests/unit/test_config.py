@@ -0,0 +1,62 @@
+"""Unit tests for the stock data fetcher configuration."""
+
+import json
+from collections.abc import Iterator
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from moto import mock_aws
+
+from modules.stock_data_fetcher import config as fetcher_config
+from modules.stock_data_fetcher.config import Config
+
+SYMBOLS_KEY = "config/symbols.json"
+
+
+class TestLoadSymbolsFromS3:
+    """Tests for loading the symbol list from S3."""
+
+    @pytest.fixture
+    def s3_client(self, monkeypatch: pytest.MonkeyPatch) -> Iterator[Any]:
+        """Create a moto bucket holding a symbol config."""
+        monkeypatch.setenv("S3_BUCKET_NAME", "test-bucket")
+        monkeypatch.setenv("AWS_REGION", "us-east-1")
+
+        with mock_aws():
+            monkeypatch.setattr(fetcher_config, "_s3_clients", {})
+            monkeypatch.setattr(fetcher_config, "_symbols_cache", {})
+            client = fetcher_config.get_s3_client("us-east-1")
+            client.create_bucket(Bucket="test-bucket")
+            client.put_object(
+                Bucket="test-bucket",
+                Key=SYMBOLS_KEY,
+                Body=json.dumps({"symbols": ["BHP", "CBA"]}).encode("utf-8"),
+            )
+            yield client
+
+    def test_unchanged_config_is_cached(self, s3_client: Any) -> None:
+        """Test that a warm call reuses the cached symbols when the ETag matches."""
+        config = Config()
+
+        with patch.object(
+            fetcher_config, "validate_config", wraps=fetcher_config.validate_config
+        ) as mock_validate:
+            first = config.load_symbols_from_s3()
+            second = config.load_symbols_from_s3()
+
+        assert first == second == ["BHP", "CBA"]
+        mock_validate.assert_called_once()
+
+    def test_changed_config_is_reloaded(self, s3_client: Any) -> None:
+        """Test that a new object version replaces the cached symbols."""
+        config = Config()
+        config.load_symbols_from_s3()
+
+        s3_client.put_object(
+            Bucket="test-bucket",
+            Key=SYMBOLS_KEY,
+            Body=json.dumps({"symbols": ["NAB"]}).encode("utf-8"),
+        )
+
+        assert config.load_symbols_from_s3() == ["NAB"]
@@ -1,25 +1,73 @@
 """Unit tests for the YahooFinanceFetcher class."""
 
-from datetime import date, timedelta
-from unittest.mock import MagicMock, Mock, patch
+import threading
+from collections.abc import Iterator
+from datetime import date
+from unittest.mock import Mock, patch
 
+import pandas as pd
 import polars as pl
 import pytest
-import yfinance as yf
+import requests
+from yfinance import Ticker
+from yfinance.exceptions import YFRateLimitError
 
 from modules.common.exceptions import DataFetchError, RateLimitError
-from modules.stock_data_fetcher.fetcher import YahooFinanceFetcher
+from modules.stock_data_fetcher.fetcher import (
+    OHLCV_SCHEMA,
+    YahooFinanceFetcher,
+    _is_rate_limit_error,
+)
+
+
+class TestIsRateLimitError:
+    """Tests for rate-limit exception dispatch."""
+
+    @staticmethod
+    def _http_error(status_code: int) -> requests.HTTPError:
+        response = requests.Response()
+        response.status_code = status_code
+        return requests.HTTPError(response=response)
+
+    def test_yfinance_rate_limit_error(self) -> None:
+        """Test yfinance's own rate-limit exception is detected."""
+        assert _is_rate_limit_error(YFRateLimitError())
+
+    def test_http_429(self) -> None:
+        """Test an HTTP 429 response is detected."""
+        assert _is_rate_limit_error(self._http_error(429))
+
+    def test_other_http_status(self) -> None:
+        """Test other HTTP errors are not treated as rate limiting."""
+        assert not _is_rate_limit_error(self._http_error(500))
+
+    def test_message_alone_is_not_rate_limit(self) -> None:
+        """Test a generic exception mentioning 429 is not treated as rate limiting."""
+        assert not _is_rate_limit_error(Exception("429 Too Many Requests"))
 
 
 class TestYahooFinanceFetcher:
     """Tests for YahooFinanceFetcher class."""
 
+    @pytest.fixture(autouse=True)
+    def mock_download(self) -> Iterator[Mock]:
+        """Keep the batch download off the network; it returns nothing."""
+        with patch("modules.stock_data_fetcher.fetcher.yf.download") as mock_download:
+            mock_download.return_value = pd.DataFrame()
+            yield mock_download
+
+    @pytest.fixture(autouse=True)
+    def mock_ticker_class(self) -> Iterator[Mock]:
+        """Patch yfinance.Ticker once for each test in the class."""
+        with patch("yfinance.Ticker") as mock_ticker_class:
+            yield mock_ticker_class
+
     @pytest.fixture
     def fetcher(self) -> YahooFinanceFetcher:
         """Create a YahooFinanceFetcher instance for testing."""
         return YahooFinanceFetcher(rate_limit_delay=0.1, max_retries=2, timeout=60)
 
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def mock_ticker_data(self) -> pl.DataFrame:
         """Create mock ticker data."""
         dates = [date(2024, 12, 24), date(2024, 12, 25), date(2024, 12, 26)]
@@ -35,140 +83,298 @@ class TestYahooFinanceFetcher:
             }
         )
 
+    @pytest.fixture(scope="session")
+    def mock_ticker_pandas(self, mock_ticker_data: pl.DataFrame) -> pd.DataFrame:
+        """Convert the mock ticker data to a Date-indexed pandas frame once per run."""
+        return mock_ticker_data.to_pandas().set_index("Date")
+
     def test_initialization(self, fetcher: YahooFinanceFetcher) -> None:
         """Test fetcher initialization."""
         assert fetcher.rate_limit_delay == 0.1
         assert fetcher.max_retries == 2
         assert fetcher.timeout == 60
 
-    @patch("yfinance.Ticker")
     def test_fetch_single_symbol_success(
-        self, mock_ticker_class: Mock, fetcher: YahooFinanceFetcher, mock_ticker_data: pl.DataFrame
+        self, mock_ticker_class: Mock, fetcher: YahooFinanceFetcher, mock_ticker_pandas: pd.DataFrame
     ) -> None:
         """Test successful single symbol fetch."""
         # Setup mock
-        mock_ticker = MagicMock()
-        mock_ticker.history.return_value = mock_ticker_data.to_pandas()
+        mock_ticker = Mock(spec=Ticker)
+        mock_ticker.history.return_value = mock_ticker_pandas
         mock_ticker_class.return_value = mock_ticker
 
         # Test
-        start_date = date(2024, 12, 24)
-        end_date = date(2024, 12, 26)
-        result = fetcher.fetch_single_symbol("BHP", start_date, end_date)
+        result = fetcher.fetch_single_symbol("BHP", date(2024, 12, 24))
 
         # Verify
-        assert isinstance(result, pl.DataFrame)
-        assert len(result) == 3
-        assert "symbol" in result.columns
-        assert all(result["symbol"] == "BHP")
-        mock_ticker_class.assert_called_once_with("BHP.AX")
+        assert result == {
+            "symbol": "BHP",
+            "date": date(2024, 12, 24),
+            "open": 50.0,
+            "high": 52.0,
+            "low": 49.0,
+            "close": 51.0,
+            "volume": 1000000,
+            "adjusted_close": 51.0,
+        }
+        mock_ticker_class.assert_called_once_with("BHP")
+        assert fetcher.get_stats()["symbols_fetched"] == 1
 
-    @patch("yfinance.Ticker")
+    @patch("time.sleep", return_value=None)  # Skip the backoff
     def test_fetch_single_symbol_with_retry(
-        self, mock_ticker_class: Mock, fetcher: YahooFinanceFetcher, mock_ticker_data: pl.DataFrame
+        self, mock_sleep: Mock, mock_ticker_class: Mock, fetcher: YahooFinanceFetcher, mock_ticker_pandas: pd.DataFrame
     ) -> None:
         """Test fetch with retry on failure."""
         # Setup mock to fail first, then succeed
-        mock_ticker = MagicMock()
+        mock_ticker = Mock(spec=Ticker)
         mock_ticker.history.side_effect = [
             Exception("Network error"),
-            mock_ticker_data.to_pandas(),
+            mock_ticker_pandas,
         ]
         mock_ticker_class.return_value = mock_ticker
 
         # Test
-        start_date = date(2024, 12, 24)
-        end_date = date(2024, 12, 26)
-        result = fetcher.fetch_single_symbol("BHP", start_date, end_date)
+        result = fetcher.fetch_single_symbol("BHP", date(2024, 12, 24))
 
         # Verify retry happened
-        assert isinstance(result, pl.DataFrame)
+        assert result is not None
+        assert result["symbol"] == "BHP"
         assert mock_ticker.history.call_count == 2
+        mock_sleep.assert_called_once()
 
-    @patch("yfinance.Ticker")
-    def test_fetch_single_symbol_rate_limit(self, mock_ticker_class: Mock, fetcher: YahooFinanceFetcher) -> None:
+    @patch("time.sleep", return_value=None)  # Skip the backoff
+    def test_fetch_single_symbol_rate_limit(
+        self, mock_sleep: Mock, mock_ticker_class: Mock, fetcher: YahooFinanceFetcher
+    ) -> None:
         """Test rate limit error handling."""
         # Setup mock to raise rate limit error
-        mock_ticker = MagicMock()
-        mock_ticker.history.side_effect = Exception("429 Too Many Requests")
+        mock_ticker = Mock(spec=Ticker)
+        mock_ticker.history.side_effect = YFRateLimitError()
         mock_ticker_class.return_value = mock_ticker
 
         # Test
-        start_date = date(2024, 12, 24)
-        end_date = date(2024, 12, 26)
         with pytest.raises(RateLimitError):
-            fetcher.fetch_single_symbol("BHP", start_date, end_date)
+            fetcher.fetch_single_symbol("BHP", date(2024, 12, 24))
 
-    @patch("yfinance.Ticker")
+        assert mock_ticker.history.call_count == fetcher.max_retries
+        assert fetcher.get_stats()["symbols_failed"] == 1
+
+    @patch("time.sleep", return_value=None)  # Skip the backoff
     def test_fetch_single_symbol_max_retries_exceeded(
-        self, mock_ticker_class: Mock, fetcher: YahooFinanceFetcher
+        self, mock_sleep: Mock, mock_ticker_class: Mock, fetcher: YahooFinanceFetcher
     ) -> None:
-        """Test that max retries raises DataFetchError."""
+        """Test that exhausting retries returns None."""
         # Setup mock to always fail
-        mock_ticker = MagicMock()
+        mock_ticker = Mock(spec=Ticker)
         mock_ticker.history.side_effect = Exception("Network error")
         mock_ticker_class.return_value = mock_ticker
 
         # Test
-        start_date = date(2024, 12, 24)
-        end_date = date(2024, 12, 26)
-        with pytest.raises(DataFetchError):
-            fetcher.fetch_single_symbol("BHP", start_date, end_date)
+        assert fetcher.fetch_single_symbol("BHP", date(2024, 12, 24)) is None
 
         # Verify max retries
-        assert mock_ticker.history.call_count == fetcher.max_retries + 1
+        assert mock_ticker.history.call_count == fetcher.max_retries
+        assert fetcher.get_stats()["symbols_failed"] == 1
 
-    @patch("yfinance.Ticker")
     def test_fetch_single_symbol_empty_data(
         self, mock_ticker_class: Mock, fetcher: YahooFinanceFetcher
     ) -> None:
         """Test handling of empty data response."""
         # Setup mock to return empty DataFrame
-        mock_ticker = MagicMock()
-        mock_ticker.history.return_value = pl.DataFrame().to_pandas()
+        mock_ticker = Mock(spec=Ticker)
+        mock_ticker.history.return_value = pd.DataFrame()
         mock_ticker_class.return_value = mock_ticker
 
         # Test
-        start_date = date(2024, 12, 24)
-        end_date = date(2024, 12, 26)
-        with pytest.raises(DataFetchError, match="No data returned"):
-            fetcher.fetch_single_symbol("BHP", start_date, end_date)
+        assert fetcher.fetch_single_symbol("BHP", date(2024, 12, 24)) is None
+        assert fetcher.get_stats()["symbols_failed"] == 1
 
-    @patch("yfinance.Ticker")
     @patch("time.sleep", return_value=None)  # Skip actual sleep
     def test_fetch_multiple_symbols(
-        self, mock_sleep: Mock, mock_ticker_class: Mock, fetcher: YahooFinanceFetcher, mock_ticker_data: pl.DataFrame
+        self, mock_sleep: Mock, mock_ticker_class: Mock, fetcher: YahooFinanceFetcher, mock_ticker_pandas: pd.DataFrame
     ) -> None:
-        """Test fetching multiple symbols with rate limiting."""
+        """Test symbols the batch misses are fetched individually, in input order."""
         # Setup mock
-        mock_ticker = MagicMock()
-        mock_ticker.history.return_value = mock_ticker_data.to_pandas()
+        mock_ticker = Mock(spec=Ticker)
+        mock_ticker.history.return_value = mock_ticker_pandas
         mock_ticker_class.return_value = mock_ticker
 
         # Test
         symbols = ["BHP", "CBA", "NAB"]
-        start_date = date(2024, 12, 24)
-        end_date = date(2024, 12, 26)
-        result = fetcher.fetch_multiple_symbols(symbols, start_date, end_date)
+        result = fetcher.fetch_multiple_symbols(symbols, date(2024, 12, 24))
 
-        # Verify
+        # Verify: one bar per symbol; spacing between requests is covered by TestThrottle
         assert isinstance(result, pl.DataFrame)
-        assert len(result) == 9  # 3 symbols * 3 days
-        assert set(result["symbol"].unique()) == set(symbols)
-        
-        # Verify rate limiting (sleep called between symbols)
-        assert mock_sleep.call_count == 2  # n-1 for n symbols
+        assert result.schema == OHLCV_SCHEMA
+        assert result["symbol"].to_list() == symbols
+        assert mock_ticker.history.call_count == len(symbols)
+
+    def test_fetch_multiple_symbols_all_failed(
+        self, mock_ticker_class: Mock, fetcher: YahooFinanceFetcher
+    ) -> None:
+        """Test that DataFetchError is raised when no symbol returns data."""
+        # Setup mock to return empty DataFrame for every symbol
+        mock_ticker = Mock(spec=Ticker)
+        mock_ticker.history.return_value = pd.DataFrame()
+        mock_ticker_class.return_value = mock_ticker
+
+        # Test
+        with pytest.raises(DataFetchError, match="any symbols"):
+            fetcher.fetch_multiple_symbols(["BHP", "CBA"], date(2024, 12, 24))
+
+        assert fetcher.get_stats()["symbols_failed"] == 2
 
     def test_get_stats(self, fetcher: YahooFinanceFetcher) -> None:
         """Test getting fetcher statistics."""
-        # Make some mock calls to increment counters
-        fetcher._success_count = 10
-        fetcher._error_count = 2
-        fetcher._rate_limit_count = 1
+        fetcher.symbols_fetched = 10
+        fetcher.symbols_failed = 2
 
         stats = fetcher.get_stats()
 
-        assert stats["success_count"] == 10
-        assert stats["error_count"] == 2
-        assert stats["rate_limit_count"] == 1
-        assert stats["total_requests"] == 13
+        assert stats == {"symbols_fetched": 10, "symbols_failed": 2, "total_symbols": 12}
+
+
+class TestThrottle:
+    """Tests for the shared request throttle."""
+
+    @patch("time.sleep", return_value=None)
+    @patch("time.monotonic", side_effect=[100.0, 100.0, 101.5, 102.0, 105.0, 105.0])
+    def test_sleeps_only_for_remaining_interval(
+        self, mock_monotonic: Mock, mock_sleep: Mock
+    ) -> None:
+        """Test that only the unused part of the interval is slept."""
+        fetcher = YahooFinanceFetcher(rate_limit_delay=2)
+
+        fetcher._throttle()  # First request goes straight out
+        fetcher._throttle()  # 1.5s elapsed, 0.5s left
+        fetcher._throttle()  # 3s elapsed, already overdue
+
+        mock_sleep.assert_called_once_with(0.5)
+
+
+class TestFetchMultipleSymbolsBatch:
+    """Tests for the batch download path of fetch_multiple_symbols."""
+
+    @pytest.fixture
+    def batch_data(self) -> pd.DataFrame:
+        """Create a yf.download-style frame with BHP and CBA."""
+        columns = pd.MultiIndex.from_product(
+            [["BHP", "CBA"], ["Open", "High", "Low", "Close", "Volume"]]
+        )
+        return pd.DataFrame(
+            [[50.0, 52.0, 49.0, 51.0, 1000.0, 60.0, 62.0, 59.0, 61.0, 2000.0]],
+            index=pd.DatetimeIndex([pd.Timestamp("2024-12-24")]),
+            columns=columns,
+        )
+
+    @patch("yfinance.Ticker")
+    @patch("yfinance.download")
+    def test_batch_with_fallback(
+        self, mock_download: Mock, mock_ticker_class: Mock, batch_data: pd.DataFrame
+    ) -> None:
+        """Test symbols missing from the batch are fetched individually."""
+        mock_download.return_value = batch_data
+        mock_ticker = Mock(spec=Ticker)
+        mock_ticker.history.return_value = pd.DataFrame(
+            {"Open": [1.0], "High": [2.0], "Low": [0.5], "Close": [1.5], "Volume": [10]},
+            index=pd.DatetimeIndex([pd.Timestamp("2024-12-24")]),
+        )
+        mock_ticker_class.return_value = mock_ticker
+
+        fetcher = YahooFinanceFetcher(rate_limit_delay=0)
+        result = fetcher.fetch_multiple_symbols(["BHP", "NAB", "CBA"], date(2024, 12, 24))
+
+        assert result.schema == OHLCV_SCHEMA
+        assert result["symbol"].to_list() == ["BHP", "NAB", "CBA"]
+        assert result["close"].to_list() == [51.0, 1.5, 61.0]
+        mock_download.assert_called_once()
+        mock_ticker_class.assert_called_once_with("NAB")
+        assert fetcher.get_stats()["symbols_fetched"] == 3
+
+    @patch("yfinance.Ticker")
+    @patch("yfinance.download")
+    def test_incomplete_batch_row_falls_back(
+        self, mock_download: Mock, mock_ticker_class: Mock, batch_data: pd.DataFrame
+    ) -> None:
+        """Test a batch bar with NaN volume is refetched instead of aborting the batch."""
+        batch_data[("CBA", "Volume")] = float("nan")
+        mock_download.return_value = batch_data
+        mock_ticker = Mock(spec=Ticker)
+        mock_ticker.history.return_value = pd.DataFrame(
+            {"Open": [1.0], "High": [2.0], "Low": [0.5], "Close": [1.5], "Volume": [10]},
+            index=pd.DatetimeIndex([pd.Timestamp("2024-12-24")]),
+        )
+        mock_ticker_class.return_value = mock_ticker
+
+        fetcher = YahooFinanceFetcher(rate_limit_delay=0)
+        result = fetcher.fetch_multiple_symbols(["BHP", "CBA"], date(2024, 12, 24))
+
+        assert result["symbol"].to_list() == ["BHP", "CBA"]
+        assert result["volume"].to_list() == [1000, 10]
+        mock_ticker_class.assert_called_once_with("CBA")
+
+    @patch("yfinance.Ticker")
+    @patch("yfinance.download")
+    def test_fallback_requests_one_day_window(
+        self, mock_download: Mock, mock_ticker_class: Mock, batch_data: pd.DataFrame
+    ) -> None:
+        """Test the per-symbol fallback asks for [date, date + 1) like the batch."""
+        mock_download.return_value = batch_data
+        mock_ticker = Mock(spec=Ticker)
+        mock_ticker.history.return_value = pd.DataFrame(
+            {"Open": [1.0], "High": [2.0], "Low": [0.5], "Close": [1.5], "Volume": [10]},
+            index=pd.DatetimeIndex([pd.Timestamp("2024-12-24")]),
+        )
+        mock_ticker_class.return_value = mock_ticker
+
+        fetcher = YahooFinanceFetcher(rate_limit_delay=0)
+        fetcher.fetch_multiple_symbols(["BHP", "NAB"], date(2024, 12, 24))
+
+        assert mock_download.call_args.kwargs["end"] == date(2024, 12, 25)
+        history_kwargs = mock_ticker.history.call_args.kwargs
+        assert history_kwargs["start"] == date(2024, 12, 24)
+        assert history_kwargs["end"] == date(2024, 12, 25)
+
+    @patch("yfinance.Ticker")
+    @patch("yfinance.download")
+    def test_fallback_fetches_concurrently(
+        self, mock_download: Mock, mock_ticker_class: Mock
+    ) -> None:
+        """Test symbols missing from the batch are fetched in parallel."""
+        mock_download.return_value = pd.DataFrame()
+        # Each history() call waits for the other, so a serial fallback would
+        # break the barrier and fail both symbols
+        barrier = threading.Barrier(2, timeout=5)
+        history = pd.DataFrame(
+            {"Open": [1.0], "High": [2.0], "Low": [0.5], "Close": [1.5], "Volume": [10]},
+            index=pd.DatetimeIndex([pd.Timestamp("2024-12-24")]),
+        )
+
+        def history_side_effect(**kwargs: object) -> pd.DataFrame:
+            barrier.wait()
+            return history
+
+        mock_ticker = Mock(spec=Ticker)
+        mock_ticker.history.side_effect = history_side_effect
+        mock_ticker_class.return_value = mock_ticker
+
+        fetcher = YahooFinanceFetcher(rate_limit_delay=0, max_retries=1)
+        result = fetcher.fetch_multiple_symbols(["BHP", "CBA"], date(2024, 12, 24))
+
+        assert result["symbol"].to_list() == ["BHP", "CBA"]
+        assert mock_ticker.history.call_count == 2
+
+    @patch("modules.stock_data_fetcher.fetcher.validate_dataframe")
+    @patch("yfinance.download")
+    def test_validate_false_skips_validation(
+        self, mock_download: Mock, mock_validate: Mock, batch_data: pd.DataFrame
+    ) -> None:
+        """Test validate=False does not run validate_dataframe."""
+        mock_download.return_value = batch_data
+
+        fetcher = YahooFinanceFetcher(rate_limit_delay=0)
+        result = fetcher.fetch_multiple_symbols(["BHP", "CBA"], date(2024, 12, 24), validate=False)
+
+        assert len(result) == 2
+        mock_validate.assert_not_called()
+        assert fetcher.validation_time == 0.0
@@ -1,25 +1,47 @@
 """Unit tests for the S3Storage class."""
 
+from collections.abc import Iterator
 from datetime import date
-from unittest.mock import MagicMock, Mock, patch
+from io import BytesIO
+from typing import Any
+from unittest.mock import Mock, patch
 
+import boto3
 import polars as pl
+import pyarrow.parquet as pq
 import pytest
 from botocore.exceptions import ClientError
+from moto import mock_aws
+from polars.testing import assert_frame_equal
 
 from modules.common.exceptions import StorageError
 from modules.stock_data_fetcher.storage import S3Storage
 
+# Real client used only as a spec, so mocks reject misspelled S3 operations
+S3_CLIENT_SPEC = boto3.client("s3", region_name="us-east-1")
+
 
 class TestS3Storage:
     """Tests for S3Storage class."""
 
+    @pytest.fixture(scope="module")
+    def shared_s3_client(self) -> Iterator[Any]:
+        """Create one moto-backed S3 client for every storage in the module."""
+        with mock_aws():
+            yield boto3.client("s3", region_name="us-east-1")
+
+    @pytest.fixture(autouse=True)
+    def mock_boto_client(self) -> Iterator[Mock]:
+        """Patch boto3.client once for each test in the class."""
+        with patch("boto3.client") as mock_boto_client:
+            yield mock_boto_client
+
     @pytest.fixture
-    def storage(self) -> S3Storage:
+    def storage(self, shared_s3_client: Any) -> S3Storage:
         """Create an S3Storage instance for testing."""
-        return S3Storage(bucket_name="test-bucket")
+        return S3Storage(bucket="test-bucket", s3_client=shared_s3_client)
 
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def sample_dataframe(self) -> pl.DataFrame:
         """Create a sample DataFrame for testing."""
         return pl.DataFrame(
@@ -35,100 +57,94 @@ class TestS3Storage:
             }
         )
 
-    def test_initialization(self, storage: S3Storage) -> None:
+    def test_initialization(self, storage: S3Storage, shared_s3_client: Any) -> None:
         """Test storage initialization."""
-        assert storage.bucket_name == "test-bucket"
-        assert storage.s3_client is not None
+        assert storage.bucket == "test-bucket"
+        assert storage.prefix == "raw-data/"
+        assert storage.s3_client is shared_s3_client
 
-    @patch("boto3.client")
     def test_upload_dataframe_success(
         self, mock_boto_client: Mock, storage: S3Storage, sample_dataframe: pl.DataFrame
     ) -> None:
         """Test successful DataFrame upload."""
         # Setup mock
-        mock_s3 = MagicMock()
+        mock_s3 = Mock(spec=S3_CLIENT_SPEC)
         mock_boto_client.return_value = mock_s3
         storage.s3_client = mock_s3
 
         # Test
-        s3_key = "raw/BHP/2024-12-25.parquet"
-        result = storage.upload_dataframe(sample_dataframe, s3_key)
+        result = storage.upload_dataframe(sample_dataframe, date(2024, 12, 25), 0)
 
         # Verify
-        assert result is True
-        mock_s3.put_object.assert_called_once()
-        call_kwargs = mock_s3.put_object.call_args[1]
-        assert call_kwargs["Bucket"] == "test-bucket"
-        assert call_kwargs["Key"] == s3_key
-        assert call_kwargs["ContentType"] == "application/x-parquet"
+        assert result == "raw-data/2024-12-25-batch-0.parquet"
+        mock_s3.upload_fileobj.assert_called_once()
+        args, kwargs = mock_s3.upload_fileobj.call_args
+        assert args[1:] == ("test-bucket", result)
+        assert "Config" in kwargs
 
-    @patch("boto3.client")
     def test_upload_dataframe_failure(
         self, mock_boto_client: Mock, storage: S3Storage, sample_dataframe: pl.DataFrame
     ) -> None:
         """Test DataFrame upload failure."""
         # Setup mock to raise error
-        mock_s3 = MagicMock()
-        mock_s3.put_object.side_effect = ClientError(
+        mock_s3 = Mock(spec=S3_CLIENT_SPEC)
+        mock_s3.upload_fileobj.side_effect = ClientError(
             {"Error": {"Code": "AccessDenied", "Message": "Access Denied"}}, "PutObject"
         )
         mock_boto_client.return_value = mock_s3
         storage.s3_client = mock_s3
 
         # Test
-        s3_key = "raw/BHP/2024-12-25.parquet"
         with pytest.raises(StorageError):
-            storage.upload_dataframe(sample_dataframe, s3_key)
+            storage.upload_dataframe(sample_dataframe, date(2024, 12, 25))
 
-    @patch("boto3.client")
     def test_upload_local_file_success(self, mock_boto_client: Mock, storage: S3Storage) -> None:
         """Test successful local file upload."""
         # Setup mock
-        mock_s3 = MagicMock()
+        mock_s3 = Mock(spec=S3_CLIENT_SPEC)
         mock_boto_client.return_value = mock_s3
         storage.s3_client = mock_s3
 
         # Test
         local_path = "/tmp/test.parquet"
         s3_key = "raw/test.parquet"
-        result = storage.upload_local_file(local_path, s3_key)
+        storage.upload_local_file(local_path, s3_key)
 
         # Verify
-        assert result is True
-        mock_s3.upload_file.assert_called_once_with(local_path, "test-bucket", s3_key)
+        mock_s3.upload_file.assert_called_once()
+        args, kwargs = mock_s3.upload_file.call_args
+        assert args == (local_path, "test-bucket", s3_key)
+        assert "Config" in kwargs
 
-    @patch("boto3.client")
-    def test_download_dataframe_success(self, mock_boto_client: Mock, storage: S3Storage) -> None:
+    def test_download_dataframe_success(
+        self, mock_boto_client: Mock, storage: S3Storage, sample_dataframe: pl.DataFrame
+    ) -> None:
         """Test successful DataFrame download."""
         # Setup mock
-        mock_s3 = MagicMock()
+        mock_s3 = Mock(spec=S3_CLIENT_SPEC)
         mock_boto_client.return_value = mock_s3
         storage.s3_client = mock_s3
 
-        # Mock the get_object response with Parquet data
-        mock_body = MagicMock()
-        mock_body.read.return_value = b"fake_parquet_data"
-        mock_s3.get_object.return_value = {"Body": mock_body}
+        # Mock download_fileobj to write Parquet data into the buffer
+        def write_parquet(bucket: str, key: str, buffer: Any, **kwargs: Any) -> None:
+            sample_dataframe.write_parquet(buffer)
 
-        # Mock polars read_parquet to return a DataFrame
-        with patch("polars.read_parquet") as mock_read_parquet:
-            mock_df = pl.DataFrame({"col": [1, 2, 3]})
-            mock_read_parquet.return_value = mock_df
+        mock_s3.download_fileobj.side_effect = write_parquet
 
-            # Test
-            s3_key = "raw/BHP/2024-12-25.parquet"
-            result = storage.download_dataframe(s3_key)
+        # Test
+        s3_key = "raw/BHP/2024-12-25.parquet"
+        result = storage.download_dataframe(s3_key)
 
-            # Verify
-            assert isinstance(result, pl.DataFrame)
-            mock_s3.get_object.assert_called_once_with(Bucket="test-bucket", Key=s3_key)
+        # Verify
+        assert result.equals(sample_dataframe)
+        mock_s3.download_fileobj.assert_called_once()
+        assert mock_s3.download_fileobj.call_args[0][:2] == ("test-bucket", s3_key)
 
-    @patch("boto3.client")
     def test_download_dataframe_not_found(self, mock_boto_client: Mock, storage: S3Storage) -> None:
         """Test DataFrame download when file doesn't exist."""
         # Setup mock to raise NoSuchKey error
-        mock_s3 = MagicMock()
-        mock_s3.get_object.side_effect = ClientError(
+        mock_s3 = Mock(spec=S3_CLIENT_SPEC)
+        mock_s3.download_fileobj.side_effect = ClientError(
             {"Error": {"Code": "NoSuchKey", "Message": "The specified key does not exist"}}, "GetObject"
         )
         mock_boto_client.return_value = mock_s3
@@ -139,11 +155,10 @@ class TestS3Storage:
         with pytest.raises(StorageError, match="does not exist"):
             storage.download_dataframe(s3_key)
 
-    @patch("boto3.client")
     def test_file_exists_true(self, mock_boto_client: Mock, storage: S3Storage) -> None:
         """Test checking if file exists (returns True)."""
         # Setup mock
-        mock_s3 = MagicMock()
+        mock_s3 = Mock(spec=S3_CLIENT_SPEC)
         mock_s3.head_object.return_value = {"ContentLength": 1024}
         mock_boto_client.return_value = mock_s3
         storage.s3_client = mock_s3
@@ -156,11 +171,10 @@ class TestS3Storage:
         assert result is True
         mock_s3.head_object.assert_called_once_with(Bucket="test-bucket", Key=s3_key)
 
-    @patch("boto3.client")
     def test_file_exists_false(self, mock_boto_client: Mock, storage: S3Storage) -> None:
         """Test checking if file exists (returns False)."""
         # Setup mock to raise NoSuchKey error
-        mock_s3 = MagicMock()
+        mock_s3 = Mock(spec=S3_CLIENT_SPEC)
         mock_s3.head_object.side_effect = ClientError(
             {"Error": {"Code": "NoSuchKey", "Message": "Not Found"}}, "HeadObject"
         )
@@ -174,17 +188,16 @@ class TestS3Storage:
         # Verify
         assert result is False
 
-    @patch("boto3.client")
     def test_list_files(self, mock_boto_client: Mock, storage: S3Storage) -> None:
         """Test listing files with a prefix."""
         # Setup mock
-        mock_s3 = MagicMock()
-        mock_s3.list_objects_v2.return_value = {
-            "Contents": [
-                {"Key": "raw/BHP/2024-12-25.parquet"},
-                {"Key": "raw/BHP/2024-12-26.parquet"},
+        mock_s3 = Mock(spec=S3_CLIENT_SPEC)
+        mock_s3.get_paginator.return_value.paginate.return_value = iter(
+            [
+                {"Contents": [{"Key": "raw/BHP/2024-12-25.parquet"}]},
+                {"Contents": [{"Key": "raw/BHP/2024-12-26.parquet"}]},
             ]
-        }
+        )
         mock_boto_client.return_value = mock_s3
         storage.s3_client = mock_s3
 
@@ -196,14 +209,16 @@ class TestS3Storage:
         assert len(result) == 2
         assert "raw/BHP/2024-12-25.parquet" in result
         assert "raw/BHP/2024-12-26.parquet" in result
-        mock_s3.list_objects_v2.assert_called_once_with(Bucket="test-bucket", Prefix=prefix)
+        mock_s3.get_paginator.assert_called_once_with("list_objects_v2")
+        mock_s3.get_paginator.return_value.paginate.assert_called_once_with(
+            Bucket="test-bucket", Prefix=prefix
+        )
 
-    @patch("boto3.client")
     def test_list_files_empty(self, mock_boto_client: Mock, storage: S3Storage) -> None:
         """Test listing files when none exist."""
         # Setup mock with no contents
-        mock_s3 = MagicMock()
-        mock_s3.list_objects_v2.return_value = {}
+        mock_s3 = Mock(spec=S3_CLIENT_SPEC)
+        mock_s3.get_paginator.return_value.paginate.return_value = iter([{}])
         mock_boto_client.return_value = mock_s3
         storage.s3_client = mock_s3
 
@@ -213,3 +228,73 @@ class TestS3Storage:
 
         # Verify
         assert len(result) == 0
+
+    def test_files_exist_same_date(self, mock_boto_client: Mock, storage: S3Storage) -> None:
+        """Test that keys sharing a date prefix are resolved with one listing."""
+        mock_s3 = Mock(spec=S3_CLIENT_SPEC)
+        mock_s3.get_paginator.return_value.paginate.return_value = iter(
+            [{"Contents": [{"Key": "raw-data/2024-12-25-batch-0.parquet"}]}]
+        )
+        storage.s3_client = mock_s3
+
+        keys = ["raw-data/2024-12-25-batch-0.parquet", "raw-data/2024-12-25-batch-1.parquet"]
+        result = storage.files_exist(keys)
+
+        assert result == {keys[0]: True, keys[1]: False}
+        mock_s3.get_paginator.return_value.paginate.assert_called_once_with(
+            Bucket="test-bucket", Prefix="raw-data/2024-12-25-batch-"
+        )
+        mock_s3.head_object.assert_not_called()
+
+    def test_files_exist_disjoint_dates(self, mock_boto_client: Mock, storage: S3Storage) -> None:
+        """Test that keys from different dates are checked without a listing."""
+        mock_s3 = Mock(spec=S3_CLIENT_SPEC)
+        keys = ["raw-data/2024-12-24.parquet", "raw-data/2024-12-25.parquet"]
+
+        def head_object(Bucket: str, Key: str) -> dict[str, int]:
+            if Key != keys[0]:
+                raise ClientError({"Error": {"Code": "404", "Message": "Not Found"}}, "HeadObject")
+            return {"ContentLength": 1024}
+
+        mock_s3.head_object.side_effect = head_object
+        storage.s3_client = mock_s3
+
+        # The keys still share "raw-data/2024-12-2", which spans ten dates
+        result = storage.files_exist(keys)
+
+        assert result == {keys[0]: True, keys[1]: False}
+        mock_s3.get_paginator.assert_not_called()
+        assert mock_s3.head_object.call_count == 2
+
+    def test_upload_dataframes_batch(
+        self, shared_s3_client: Any, sample_dataframe: pl.DataFrame
+    ) -> None:
+        """Test that each DataFrame is uploaded as its own batch file."""
+        shared_s3_client.create_bucket(Bucket="test-bucket")
+        storage = S3Storage(bucket="test-bucket", s3_client=shared_s3_client)
+
+        keys = storage.upload_dataframes_batch(
+            [sample_dataframe] * 3, upload_date=date(2024, 12, 26), max_workers=3
+        )
+
+        assert keys == [f"raw-data/2024-12-26-batch-{i}.parquet" for i in range(3)]
+        for key in keys:
+            assert_frame_equal(storage.download_dataframe(key), sample_dataframe)
+
+    def test_upload_dataframe_uses_zstd(
+        self, shared_s3_client: Any, sample_dataframe: pl.DataFrame
+    ) -> None:
+        """Test that uploaded Parquet files are zstd-compressed."""
+        shared_s3_client.create_bucket(Bucket="test-zstd-bucket")
+        storage = S3Storage(bucket="test-zstd-bucket", s3_client=shared_s3_client)
+
+        key = storage.upload_dataframe(sample_dataframe, upload_date=date(2024, 12, 26))
+
+        body = shared_s3_client.get_object(Bucket="test-zstd-bucket", Key=key)["Body"].read()
+        metadata = pq.ParquetFile(BytesIO(body)).metadata
+        codecs = {
+            metadata.row_group(i).column(j).compression
+            for i in range(metadata.num_row_groups)
+            for j in range(metadata.num_columns)
+        }
+        assert codecs == {"ZSTD"}
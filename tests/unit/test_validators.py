@@ -1,77 +1,102 @@
 """Unit tests for validators module."""
 
-import pytest
+import re
 from datetime import date
 
+import polars as pl
+import pytest
+
 from modules.common.exceptions import ValidationError
 from modules.common.validators import (
     validate_symbol,
+    validate_symbols_bulk,
     validate_date,
     validate_ohlcv_row,
+    validate_ohlcv_dataframe,
+    validate_dataframe,
     validate_config,
 )
 
+# Error message patterns, compiled once for pytest.raises(match=...)
+_CANNOT_BE_EMPTY = re.compile("cannot be empty")
+_INVALID_SYMBOL_FORMAT = re.compile("Invalid symbol format")
+_INVALID_DATE_FORMAT = re.compile("Invalid date format")
+_IN_THE_FUTURE = re.compile("cannot be in the future")
+_TOO_FAR_IN_PAST = re.compile("too far in the past")
+_MISSING_CONFIG_KEYS = re.compile("Missing required configuration")
+_EMPTY_SYMBOLS_LIST = re.compile("symbols' list is empty")
+
 
 class TestValidateSymbol:
     """Tests for symbol validation."""
 
-    def test_valid_symbols(self) -> None:
+    @pytest.mark.parametrize("symbol", ["BHP", "CBA", "NAB", "A", "WBC1"])
+    def test_valid_symbol(self, symbol: str) -> None:
         """Test validation of valid symbols."""
-        valid_symbols = ["BHP", "CBA", "NAB", "A", "WBC1"]
-        for symbol in valid_symbols:
-            validate_symbol(symbol)  # Should not raise
+        validate_symbol(symbol)  # Should not raise
 
-    def test_invalid_empty_symbol(self) -> None:
-        """Test that empty symbol raises ValidationError."""
-        with pytest.raises(ValidationError, match="cannot be empty"):
-            validate_symbol("")
+    @pytest.mark.parametrize(
+        ("symbol", "message"),
+        [
+            pytest.param("", _CANNOT_BE_EMPTY, id="empty"),
+            pytest.param("bhp", _INVALID_SYMBOL_FORMAT, id="lowercase"),
+            pytest.param("TOOLONG", _INVALID_SYMBOL_FORMAT, id="too-long"),
+            pytest.param("BHP-A", _INVALID_SYMBOL_FORMAT, id="special-chars"),
+            pytest.param("BHP\n", _INVALID_SYMBOL_FORMAT, id="trailing-newline"),
+        ],
+    )
+    def test_invalid_symbol(self, symbol: str, message: re.Pattern[str]) -> None:
+        """Test that invalid symbols raise ValidationError."""
+        with pytest.raises(ValidationError, match=message):
+            validate_symbol(symbol)
 
-    def test_invalid_lowercase_symbol(self) -> None:
-        """Test that lowercase symbol raises ValidationError."""
-        with pytest.raises(ValidationError, match="Invalid symbol format"):
-            validate_symbol("bhp")
 
-    def test_invalid_long_symbol(self) -> None:
-        """Test that too-long symbol raises ValidationError."""
-        with pytest.raises(ValidationError, match="Invalid symbol format"):
-            validate_symbol("TOOLONG")
+class TestValidateSymbolsBulk:
+    """Tests for bulk symbol validation."""
 
-    def test_invalid_special_chars(self) -> None:
-        """Test that symbols with special characters raise ValidationError."""
-        with pytest.raises(ValidationError, match="Invalid symbol format"):
-            validate_symbol("BHP-A")
+    def test_valid_symbols(self) -> None:
+        """Test validation of a valid symbol list."""
+        validate_symbols_bulk(["BHP", "CBA", "NAB", "A", "WBC1"])  # Should not raise
+
+    def test_reports_all_invalid_symbols(self) -> None:
+        """Test that every invalid symbol is reported in one error."""
+        with pytest.raises(ValidationError, match=_INVALID_SYMBOL_FORMAT) as exc_info:
+            validate_symbols_bulk(["BHP", "bhp", "", "TOOLONG", "BH-P", "BHP\n", 123])
+        assert exc_info.value.details["symbols"] == ["bhp", "", "TOOLONG", "BH-P", "BHP\n", 123]
 
 
 class TestValidateDate:
     """Tests for date validation."""
 
-    def test_valid_date_object(self) -> None:
-        """Test validation of valid date object."""
-        test_date = date(2024, 1, 1)
-        result = validate_date(test_date)
-        assert result == test_date
-
-    def test_valid_date_string(self) -> None:
-        """Test validation of valid date string."""
-        result = validate_date("2024-01-01")
-        assert result == date(2024, 1, 1)
-
-    def test_invalid_date_string(self) -> None:
-        """Test that invalid date string raises ValidationError."""
-        with pytest.raises(ValidationError, match="Invalid date format"):
-            validate_date("2024-13-01")  # Invalid month
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [
+            pytest.param(date(2024, 1, 1), date(2024, 1, 1), id="date-object"),
+            pytest.param("2024-01-01", date(2024, 1, 1), id="date-string"),
+        ],
+    )
+    def test_valid_date(self, value: date | str, expected: date) -> None:
+        """Test validation of valid dates."""
+        assert validate_date(value) == expected
 
-    def test_future_date(self) -> None:
-        """Test that future date raises ValidationError."""
-        future_date = date(2030, 1, 1)
-        with pytest.raises(ValidationError, match="cannot be in the future"):
-            validate_date(future_date)
+    @pytest.mark.parametrize(
+        ("value", "message"),
+        [
+            pytest.param("2024-13-01", _INVALID_DATE_FORMAT, id="invalid-month"),
+            pytest.param(date(2030, 1, 1), _IN_THE_FUTURE, id="future"),
+            pytest.param(date(1989, 1, 1), _TOO_FAR_IN_PAST, id="before-1990"),
+        ],
+    )
+    def test_invalid_date(self, value: date | str, message: re.Pattern[str]) -> None:
+        """Test that invalid dates raise ValidationError."""
+        with pytest.raises(ValidationError, match=message):
+            validate_date(value)
 
-    def test_too_old_date(self) -> None:
-        """Test that date before 1990 raises ValidationError."""
-        old_date = date(1989, 1, 1)
-        with pytest.raises(ValidationError, match="too far in the past"):
-            validate_date(old_date)
+    def test_explicit_today(self) -> None:
+        """Test that the future-date check uses the supplied reference date."""
+        assert validate_date("2024-06-01", today=date(2024, 6, 1)) == date(2024, 6, 1)
+        with pytest.raises(ValidationError, match=_IN_THE_FUTURE):
+            validate_date("2024-06-02", today=date(2024, 6, 1))
 
 
 class TestValidateOHLCVRow:
@@ -135,6 +160,119 @@ class TestValidateOHLCVRow:
         assert len(errors) > 0
         assert any("Suspicious price change" in error for error in errors)
 
+    def test_zero_open(self) -> None:
+        """Test that a zero open is reported instead of dividing by zero."""
+        row = {
+            "open": 0.0,
+            "high": 52.0,
+            "low": 0.0,
+            "close": 51.0,
+            "volume": 1000000,
+        }
+        errors = validate_ohlcv_row(row)
+        assert "open must be positive: 0.0" in errors
+        assert not any("Suspicious price change" in error for error in errors)
+
+    def test_dataframe_checks_match_row_validation(self) -> None:
+        """Test that the vectorized checks fail exactly where the row checks do."""
+        rows = [
+            {"open": 50.0, "high": 52.0, "low": 49.0, "close": 51.0, "volume": 1000000},
+            {"open": -50.0, "high": 52.0, "low": 49.0, "close": 51.0, "volume": 1000000},
+            {"open": 50.0, "high": 48.0, "low": 49.0, "close": 50.0, "volume": 1000000},
+            {"open": 50.0, "high": 100.0, "low": 50.0, "close": 100.0, "volume": 1000000},
+            {"open": 0.0, "high": 52.0, "low": 0.0, "close": 51.0, "volume": -1},
+            {"open": 10.0, "high": 11.0, "low": 9.0, "close": float("nan"), "volume": 1000},
+            {"open": float("inf"), "high": 52.0, "low": 49.0, "close": 51.0, "volume": 1000},
+        ]
+        passed = validate_ohlcv_dataframe(pl.DataFrame(rows))
+
+        assert passed.height == len(rows)
+        assert all(dtype == pl.Boolean for dtype in passed.dtypes)
+        for row, results in zip(rows, passed.iter_rows(), strict=True):
+            assert results.count(False) == len(validate_ohlcv_row(row))
+
+
+class TestValidateDataFrame:
+    """Tests for DataFrame validation."""
+
+    @pytest.fixture
+    def valid_rows(self) -> list[dict]:
+        """Create valid OHLCV rows."""
+        return [
+            {
+                "symbol": "BHP",
+                "date": date(2024, 12, 24),
+                "open": 50.0,
+                "high": 52.0,
+                "low": 49.0,
+                "close": 51.0,
+                "volume": 1000000,
+            },
+            {
+                "symbol": "CBA",
+                "date": date(2024, 12, 24),
+                "open": 100.0,
+                "high": 102.0,
+                "low": 99.0,
+                "close": 101.0,
+                "volume": 2000000,
+            },
+        ]
+
+    def test_valid_dataframe(self, valid_rows: list[dict]) -> None:
+        """Test validation of valid DataFrame."""
+        errors = validate_dataframe(pl.DataFrame(valid_rows))
+        assert errors == []
+
+    def test_invalid_rows_match_row_validation(self, valid_rows: list[dict]) -> None:
+        """Test that invalid rows report the same errors as validate_ohlcv_row."""
+        invalid_row = {
+            "symbol": "NAB",
+            "date": date(2024, 12, 24),
+            "open": -50.0,
+            "high": 48.0,
+            "low": 49.0,
+            "close": 100.0,
+            "volume": -1,
+        }
+        errors = validate_dataframe(pl.DataFrame([*valid_rows, invalid_row]))
+
+        expected = [f"Row NAB 2024-12-24: {e}" for e in validate_ohlcv_row(invalid_row)]
+        assert errors == expected
+
+    def test_zero_open_matches_row_validation(self, valid_rows: list[dict]) -> None:
+        """Test that a zero open reports the same errors as validate_ohlcv_row."""
+        valid_rows[0].update(open=0.0, low=0.0)
+        errors = validate_dataframe(pl.DataFrame(valid_rows))
+
+        expected = [f"Row BHP 2024-12-24: {e}" for e in validate_ohlcv_row(valid_rows[0])]
+        assert errors == expected
+
+    def test_nan_matches_row_validation(self, valid_rows: list[dict]) -> None:
+        """Test that a NaN price is only reported as not finite, as in validate_ohlcv_row."""
+        valid_rows[0]["close"] = float("nan")
+        errors = validate_dataframe(pl.DataFrame(valid_rows))
+
+        expected = [f"Row BHP 2024-12-24: {e}" for e in validate_ohlcv_row(valid_rows[0])]
+        assert errors == expected == ["Row BHP 2024-12-24: close is not finite: nan"]
+
+    def test_non_finite_value(self, valid_rows: list[dict]) -> None:
+        """Test that infinite prices are detected."""
+        valid_rows[0]["high"] = float("inf")
+        errors = validate_dataframe(pl.DataFrame(valid_rows))
+        assert any("high is not finite" in error for error in errors)
+
+    def test_duplicate_rows(self, valid_rows: list[dict]) -> None:
+        """Test that duplicate (symbol, date) pairs are detected."""
+        errors = validate_dataframe(pl.DataFrame([valid_rows[0], valid_rows[0]]))
+        assert "Found 1 duplicate (symbol, date) pairs" in errors
+
+    def test_missing_columns(self) -> None:
+        """Test that missing required columns are detected."""
+        errors = validate_dataframe(pl.DataFrame({"symbol": ["BHP"]}))
+        assert len(errors) == 1
+        assert "Missing required columns" in errors[0]
+
 
 class TestValidateConfig:
     """Tests for configuration validation."""
@@ -147,17 +285,17 @@ class TestValidateConfig:
     def test_missing_symbols_key(self) -> None:
         """Test that missing symbols key raises ValidationError."""
         config = {}
-        with pytest.raises(ValidationError, match="Missing required configuration"):
+        with pytest.raises(ValidationError, match=_MISSING_CONFIG_KEYS):
             validate_config(config)
 
     def test_empty_symbols_list(self) -> None:
         """Test that empty symbols list raises ValidationError."""
         config = {"symbols": []}
-        with pytest.raises(ValidationError, match="symbols' list is empty"):
+        with pytest.raises(ValidationError, match=_EMPTY_SYMBOLS_LIST):
             validate_config(config)
 
     def test_invalid_symbol_in_list(self) -> None:
         """Test that invalid symbol in list raises ValidationError."""
         config = {"symbols": ["BHP", "invalid-symbol", "CBA"]}
-        with pytest.raises(ValidationError, match="Invalid symbol format"):
+        with pytest.raises(ValidationError, match=_INVALID_SYMBOL_FORMAT):
             validate_config(config)